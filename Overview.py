@@ -1,12 +1,18 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
 
 from utils import format_number
+from data_store import load_data
+from aggregates import group_names, group_stat
+from export import DATA_FORMATS, export_frame, frame_bytes
+from figures import OVERVIEW_CHART_INPUTS, overview_figures, show_figure
+from growth import load_growth
+from instrumentation import begin_run, end_run, span
+from rerun_graph import RerunGraph, select
+from smoothing import SMOOTHING_OPTIONS
 
 st.set_page_config(page_title="Economic Overview Dashboard", layout="wide")
+begin_run("Overview")
 st.markdown("""
     <style>
         body {
@@ -25,9 +31,22 @@ st.markdown("""
 # ======================================
 # Load Data
 # ======================================
-df = pd.read_csv('data/world_bank_data.csv')
-countries = ["Worldwide"] + sorted(df['country_name'].unique())
-years = [year for year in sorted(df['year'].unique()) if year <= 2023]
+OVERVIEW_INDICATORS = [
+    'GDP (Current USD)',
+    'GDP per Capita (Current USD)',
+    'Gross National Income (USD)',
+    'Inflation (CPI %)',
+    'Government Revenue (% of GDP)',
+    'Government Expense (% of GDP)',
+    'Unemployment Rate (%)',
+    'Interest Rate (Real, %)',
+    'Current Account Balance (% GDP)',
+]
+with span("load"):
+    df = load_data(OVERVIEW_INDICATORS)
+    groups = group_names()
+    countries = groups + list(df['country_name'].cat.categories)
+    years = [year for year in sorted(df['year'].unique()) if year <= 2023]
 
 # ======================================
 # Sidebar Filters and Title
@@ -36,194 +55,97 @@ st.title("Economic Overview Dashboard")
 st.sidebar.header("Filter")
 country = st.sidebar.selectbox("Country", countries)
 year_range = st.sidebar.slider("Year Range", min_value=min(years), max_value=max(years), value=(min(years), max(years)))
-
-# ======================================
-#  Filter Data
-# ======================================
-if country == "Worldwide":
-    filtered = df[df['year'] == year_range[1]].groupby('year').mean(numeric_only=True).reset_index()
-    filtered_range = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])].groupby('year').mean(numeric_only=True).reset_index()
-else:
-    filtered = df[(df['country_name'] == country) & (df['year'] == year_range[1])]
-    filtered_range = df[(df['country_name'] == country) & (df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
+smoothing = SMOOTHING_OPTIONS[st.sidebar.selectbox("Smoothing", list(SMOOTHING_OPTIONS))]
+
+# Metric, export, dan chart di bawah masing-masing mendeklarasikan input-nya
+# dan hanya dihitung ulang kalau input itu berubah (lihat rerun_graph.py);
+# mis. geser tahun awal tidak menghitung ulang metric (hanya pakai tahun akhir).
+graph = RerunGraph("overview")
+inputs = {"country": country, "year_start": year_range[0], "year_end": year_range[1], "smoothing": smoothing}
+
+# Export data pilihan saat ini (tanpa perlu copy angka / screenshot)
+def build_export(country, year_start, year_end, export_format):
+    return frame_bytes(export_frame([country], (year_start, year_end), OVERVIEW_INDICATORS), export_format)
+
+# Bytes baru dibuat saat tombol "Prepare" diklik (bukan tiap geser slider) dan
+# disimpan di graph sampai pilihan negara/tahun/format berubah.
+with st.sidebar.expander("Export"):
+    export_format = st.radio("Format", DATA_FORMATS, horizontal=True)
+    export_inputs = {**select(inputs, ["country", "year_start", "year_end"]), "export_format": export_format}
+    if st.button("Prepare download"):
+        with span("export.data"):
+            graph.node("export", build_export, **export_inputs)
+    if graph.fresh("export", export_inputs):
+        st.download_button(
+            "Download data",
+            graph.get("export"),
+            file_name=f"overview_{country}_{year_range[0]}-{year_range[1]}.{export_format}",
+        )
 
 # ======================================
 #  Metrics Row
 # ======================================
-col1, col2, col3 = st.columns(3)
-def safe_get_value(df, col, fallback=np.nan):
-    return df[col].values[0] if not df.empty and col in df.columns else fallback
-
-
 latest_year = year_range[1]
-previous_year = latest_year - 1
-
-if country == "Worldwide":
-    filtered_latest = df[df['year'] == latest_year].mean(numeric_only=True)
-    filtered_prev = df[df['year'] == previous_year].mean(numeric_only=True)
-
-    gdp = filtered_latest['GDP (Current USD)']
-    gdp_per_capita = filtered_latest['GDP per Capita (Current USD)']
-    gni = filtered_latest['Gross National Income (USD)']
 
-    prev_gdp = filtered_prev['GDP (Current USD)']
-    prev_gdp_per_capita = filtered_prev['GDP per Capita (Current USD)']
-    prev_gni = filtered_prev['Gross National Income (USD)']
-else:
-    filtered_latest = df[(df['country_name'] == country) & (df['year'] == latest_year)]
-    filtered_prev = df[(df['country_name'] == country) & (df['year'] == previous_year)]
-
-    gdp = filtered_latest['GDP (Current USD)'].iloc[0] if not filtered_latest.empty else np.nan
-    gdp_per_capita = filtered_latest['GDP per Capita (Current USD)'].iloc[0] if not filtered_latest.empty else np.nan
-    gni = filtered_latest['Gross National Income (USD)'].iloc[0] if not filtered_latest.empty else np.nan
-
-    prev_gdp = safe_get_value(filtered_prev, 'GDP (Current USD)')
-    prev_gdp_per_capita = safe_get_value(filtered_prev, 'GDP per Capita (Current USD)')
-    prev_gni = safe_get_value(filtered_prev, 'Gross National Income (USD)')
-
-gdp_growth = ((gdp - prev_gdp) / prev_gdp * 100) if not pd.isna(prev_gdp) and prev_gdp != 0 else None
-gdp_pc_growth = ((gdp_per_capita - prev_gdp_per_capita) / prev_gdp_per_capita * 100) if not pd.isna(prev_gdp_per_capita) and prev_gdp_per_capita != 0 else None
-gni_growth = ((gni - prev_gni) / prev_gni * 100) if not pd.isna(prev_gni) and prev_gni != 0 else None
+# Nilai & pertumbuhan YoY dibaca dari tabel growth yang sudah dihitung saat load
+growth = load_growth()
+def metric_growth(country, col, year):
+    value = growth.yoy_of(country, col, year)
+    return None if pd.isna(value) else value
+
+# Untuk grup: median lintas negara anggota & jumlah negara yang melapor
+def group_summary(country, year_end):
+    column = 'GDP per Capita (Current USD)'
+    median = group_stat(country, "median", year_end)[column]
+    count = group_stat(country, "count", year_end)[column]
+    if median.empty:
+        return None
+    return {"median": float(median.iloc[0]), "count": int(count.iloc[0])}
+
+def build_metrics(country, year_end):
+    return {
+        "gdp": growth.value(country, 'GDP (Current USD)', year_end),
+        "gdp_per_capita": growth.value(country, 'GDP per Capita (Current USD)', year_end),
+        "gni": growth.value(country, 'Gross National Income (USD)', year_end),
+        "gdp_growth": metric_growth(country, 'GDP (Current USD)', year_end),
+        "gdp_pc_growth": metric_growth(country, 'GDP per Capita (Current USD)', year_end),
+        "gni_growth": metric_growth(country, 'Gross National Income (USD)', year_end),
+        "group": group_summary(country, year_end) if country in groups else None,
+    }
+
+with span("aggregate.metrics"):
+    metrics = graph.node("metrics", build_metrics, **select(inputs, ["country", "year_end"]))
+gdp, gdp_per_capita, gni = metrics["gdp"], metrics["gdp_per_capita"], metrics["gni"]
+gdp_growth, gdp_pc_growth, gni_growth = metrics["gdp_growth"], metrics["gdp_pc_growth"], metrics["gni_growth"]
 
 
 col1, col2, col3 = st.columns(3)
 col1.metric(f"GDP in {year_range[1]}", f"{format_number(gdp)} USD", f"{gdp_growth:.2f}% from last year" if gdp_growth is not None else "N/A")
 col2.metric(f"GDP per Capita in {year_range[1]}", f"{format_number(gdp_per_capita)} USD", f"{gdp_pc_growth:.2f}% from last year" if gdp_pc_growth is not None else "N/A")
 col3.metric(f"Gross National Income in {year_range[1]}", f"{format_number(gni)} USD", f"{gni_growth:.2f}% from last year" if gni_growth is not None else "N/A")
+if metrics["group"] is not None and metrics["group"]["count"]:
+    col2.caption(f"Median across {metrics['group']['count']} reporting countries: {format_number(metrics['group']['median'])} USD")
 
 
 # ======================================
 #  Charts Grid
 # ======================================
-grid1_col1, grid1_col2 = st.columns(2)
-fig_gdp = px.line(
-    filtered_range,
-    x='year',
-    y='GDP per Capita (Current USD)',
-    labels={'GDP (Current USD)': 'Inflation'},
-    title='GDP Per Capita'
-)
-fig_gdp.update_traces(
-    hovertemplate='<b>Year:</b> %{x}<br><b>GDP Per Capita:</b> %{y}<extra></extra>',
-    line=dict(width=4)
-)
-fig_gdp.update_layout(
-    title=dict(
-        text='GDP Per Capita Trend',
-        font=dict(size=28)
-    ),
-    xaxis_title="Year",
-)
-grid1_col1.plotly_chart(fig_gdp, use_container_width=True)
-
-# Inflation Chart
-fig_inflation = px.line(
-    filtered_range,
-    x='year',
-    y='Inflation (CPI %)',
-    labels={'Inflation (CPI %)': 'Inflation'},
-    title='Inflation Rate Trend'
+figs = graph.nodes(
+    {name: select(inputs, keys) for name, keys in OVERVIEW_CHART_INPUTS.items()},
+    lambda stale: overview_figures(df, country, year_range, smoothing, stale),
 )
-fig_inflation.update_traces(
-    hovertemplate='<b>Year:</b> %{x}<br><b>Inflation:</b> %{y:.2f}%<extra></extra>',
-    line=dict(width=4)
-)
-fig_inflation.update_layout(
-    title=dict(
-        text='Inflation Rate',
-        font=dict(size=28)
-    ),
-    xaxis_title="Year",
-)
-grid1_col2.plotly_chart(fig_inflation, use_container_width=True)
+grid1_col1, grid1_col2 = st.columns(2)
+show_figure(figs['gdp_per_capita'], grid1_col1)
+show_figure(figs['inflation'], grid1_col2)
 
-# Revenue vs Expense Bar Chart
+# Revenue vs Expense & Unemployment
 grid2_col1, grid2_col2 = st.columns(2)
-
-fig_rev_exp = go.Figure()
-
-fig_rev_exp.add_trace(go.Bar(
-    x=filtered_range['year'],
-    y=filtered_range['Government Revenue (% of GDP)'],
-    name='Revenue',
-    hovertemplate='<b>Year:</b> %{x}<br><b>Revenue:</b> %{y:.2f}% of GDP<extra></extra>'
-))
-fig_rev_exp.add_trace(go.Bar(
-    x=filtered_range['year'],
-    y=filtered_range['Government Expense (% of GDP)'],
-    name='Expense',
-    hovertemplate='<b>Year:</b> %{x}<br><b>Expense:</b> %{y:.2f}% of GDP<extra></extra>'
-))
-fig_rev_exp.update_layout(
-    barmode='group',
-    title=dict(
-        text='Government Revenue vs Expense',
-        font=dict(size=28)
-    ),
-    xaxis_title="Year",
-    yaxis_title='% of GDP',
-)
-grid2_col1.plotly_chart(fig_rev_exp, use_container_width=True)
-
-# Unemployment Chart
-fig_unemployment = px.bar(
-    filtered_range,
-    x='year',
-    y='Unemployment Rate (%)',
-    labels={'Unemployment Rate (%)': 'Unemployment (%)'},
-    title='Unemployment Rate Trend'
-)
-fig_unemployment.update_traces(
-    hovertemplate='<b>Year:</b> %{x}<br><b>Unemployment:</b> %{y:.2f}%<extra></extra>'
-)
-fig_unemployment.update_layout(
-    title=dict(
-        text='Unemployment Rate',
-        font=dict(size=28)
-    ),
-    xaxis_title="Year",
-)
-grid2_col2.plotly_chart(fig_unemployment, use_container_width=True)
+show_figure(figs['revenue_expense'], grid2_col1)
+show_figure(figs['unemployment'], grid2_col2)
 
 # Interest Rate & Current Account Balance
 grid3_col1, grid3_col2 = st.columns(2)
+show_figure(figs['interest_rate'], grid3_col1)
+show_figure(figs['current_account'], grid3_col2)
 
-fig_ir = px.line(
-    filtered_range,
-    x='year',
-    y='Interest Rate (Real, %)',
-    labels={'Interest Rate (Real, %)': 'Interest Rate (%)'},
-    title='Interest Rate'
-)
-fig_ir.update_traces(
-    hovertemplate='<b>Year:</b> %{x}<br><b>Interest Rate:</b> %{y:.2f}%<extra></extra>',
-    line=dict(width=4)
-)
-fig_ir.update_layout(
-    title=dict(
-        text='Interest Rate',
-        font=dict(size=28)
-    ),
-    xaxis_title="Year",
-)
-grid3_col1.plotly_chart(fig_ir, use_container_width=True)
-
-fig_cab = px.line(
-    filtered_range,
-    x='year',
-    y='Current Account Balance (% GDP)',
-    labels={'Current Account Balance (% GDP)': 'Current Account Balance (% of GDP)'},
-    title='Current Account Balance Trend'
-)
-fig_cab.update_traces(
-    hovertemplate='<b>Year:</b> %{x}<br><b>Current Account Balance:</b> %{y:.2f}% of GDP<extra></extra>',
-    line=dict(width=4)
-)
-fig_cab.update_layout(
-    title=dict(
-        text='Current Account Balance',
-        font=dict(size=28)
-    ),
-    xaxis_title="Year",
-)
-grid3_col2.plotly_chart(fig_cab, use_container_width=True)
\ No newline at end of file
+end_run()
\ No newline at end of file
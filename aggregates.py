@@ -0,0 +1,211 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_store import (
+    GDP_COLUMN,
+    GDP_PER_CAPITA_COLUMN,
+    GROUPS_PATH,
+    CountryYearIndex,
+    indicator_columns,
+    load_artifacts,
+    load_data,
+    read_dataset,
+)
+from instrumentation import instrumented
+
+WORLDWIDE = "Worldwide"
+# Statistik lintas negara anggota per grup x tahun x indikator, di samping
+# rollup utama (AGGREGATION_METHODS): rata-rata biasa, median, rata-rata
+# tertimbang GDP, dan jumlah negara yang melapor (non-null).
+GROUP_STATS = ["mean", "median", "gdp_weighted", "count"]
+INCOME_GROUPS = ["High income", "Upper middle income", "Lower middle income", "Low income"]
+
+# Cara menggabungkan tiap indikator antar negara:
+#   "sum"        -> jumlah (level, mis. GDP dunia)
+#   "mean"       -> rata-rata biasa
+#   "gdp"        -> rata-rata tertimbang GDP
+#   "population" -> rata-rata tertimbang populasi (GDP / GDP per kapita)
+#   nama kolom / Series -> rata-rata tertimbang bobot custom
+AGGREGATION_METHODS = {
+    "GDP (Current USD)": "sum",
+    "Gross National Income (USD)": "sum",
+    "GDP per Capita (Current USD)": "population",
+    "Unemployment Rate (%)": "population",
+    "Inflation (CPI %)": "gdp",
+    "Inflation (GDP Deflator, %)": "gdp",
+    "GDP Growth (% Annual)": "gdp",
+    "Interest Rate (Real, %)": "gdp",
+    "Current Account Balance (% GDP)": "gdp",
+    "Government Expense (% of GDP)": "gdp",
+    "Government Revenue (% of GDP)": "gdp",
+    "Tax Revenue (% of GDP)": "gdp",
+    "Public Debt (% of GDP)": "gdp",
+}
+
+
+def population(df):
+    return df[GDP_COLUMN] / df[GDP_PER_CAPITA_COLUMN]
+
+
+def _weight_column(df, method):
+    if method in ("sum", "mean"):
+        return np.ones(len(df))
+    if method == "gdp":
+        return df[GDP_COLUMN].to_numpy(dtype=np.float64)
+    if method == "population":
+        return population(df).to_numpy(dtype=np.float64)
+    if isinstance(method, str):
+        return df[method].to_numpy(dtype=np.float64)
+    return np.asarray(method, dtype=np.float64)
+
+
+# Semua grup x tahun x indikator dalam satu pass: data disusun jadi array
+# negara x tahun x indikator, keanggotaan grup jadi matriks grup x negara,
+# lalu dijumlahkan dengan einsum. Grup boleh saling overlap.
+def aggregate_arrays(df, groups, methods=None, index=None, columns=None):
+    index = index if index is not None else CountryYearIndex(df)
+    columns = columns if columns is not None else indicator_columns(df)
+    methods = {**AGGREGATION_METHODS, **(methods or {})}
+    col_methods = [methods.get(col, "mean") for col in columns]
+
+    values = index.dense(df[columns].to_numpy(dtype=np.float64))
+    weights = index.dense(np.column_stack([_weight_column(df, m) for m in col_methods]))
+
+    membership = np.zeros((len(groups), len(index.countries)))
+    for g, countries in enumerate(groups.values()):
+        membership[g, index.country_positions(countries)] = 1.0
+
+    valid = ~np.isnan(values) & ~np.isnan(weights)
+    weights = np.where(valid, weights, 0.0)
+    weighted_sum = np.einsum("gc,cyk->gyk", membership, np.where(valid, values * weights, 0.0))
+    weight_total = np.einsum("gc,cyk->gyk", membership, weights)
+    count = np.einsum("gc,cyk->gyk", membership, valid.astype(np.float64))
+
+    is_sum = np.array([m == "sum" for m in col_methods])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = np.where(is_sum, weighted_sum, weighted_sum / weight_total)
+    result[(count == 0) | (~is_sum & (weight_total == 0))] = np.nan
+    return result, count.astype(np.int64), index, columns
+
+
+def _to_frame(arr, groups, index, columns):
+    years = np.arange(index.first_year, index.last_year + 1)
+    row_index = pd.MultiIndex.from_product([list(groups), years], names=["group", "year"])
+    return pd.DataFrame(arr.reshape(-1, len(columns)), index=row_index, columns=columns)
+
+
+# groups: {nama grup: [nama negara, ...]}. Hasil: index (group, year),
+# kolom = indikator.
+def aggregate(df, groups, methods=None, index=None, columns=None):
+    result, _, index, columns = aggregate_arrays(df, groups, methods, index, columns)
+    return _to_frame(result, groups, index, columns)
+
+
+# Region & kelompok pendapatan World Bank (klasifikasi FY2025) per kode ISO2
+# di data/country_groups.csv. Negara tanpa klasifikasi dibiarkan kosong.
+def read_country_groups(path=GROUPS_PATH):
+    return pd.read_csv(path, keep_default_na=False)
+
+
+# {nama grup: [nama negara]}: Worldwide, lalu region, lalu kelompok pendapatan.
+def group_definitions(df, country_groups=None):
+    country_groups = country_groups if country_groups is not None else read_country_groups()
+    names = df[["country_id", "country_name"]].drop_duplicates().astype(str)
+    merged = names.merge(country_groups, on="country_id", how="left").fillna("")
+
+    groups = {WORLDWIDE: sorted(names["country_name"])}
+    for region in sorted(r for r in merged["region"].unique() if r):
+        groups[region] = sorted(merged.loc[merged["region"] == region, "country_name"])
+    for income in INCOME_GROUPS:
+        members = sorted(merged.loc[merged["income_group"] == income, "country_name"])
+        if members:
+            groups[income] = members
+    return groups
+
+
+def build_group_rollups(df, groups=None):
+    return aggregate(df, groups if groups is not None else group_definitions(df))
+
+
+# {stat: array grup x tahun x indikator}; urutan grup = urutan groups.
+def build_group_stats(df, groups=None):
+    groups = groups if groups is not None else group_definitions(df)
+    index = CountryYearIndex(df)
+    columns = indicator_columns(df)
+    mean, count, _, _ = aggregate_arrays(df, groups, {col: "mean" for col in columns}, index, columns)
+    gdp_weighted, _, _, _ = aggregate_arrays(df, groups, {col: "gdp" for col in columns}, index, columns)
+
+    values = index.dense(df[columns].to_numpy(dtype=np.float64))
+    median = np.full(mean.shape, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for g, countries in enumerate(groups.values()):
+            members = index.country_positions(countries)
+            if len(members):
+                median[g] = np.nanmedian(values[members], axis=0)
+    return {"mean": mean, "median": median, "gdp_weighted": gdp_weighted, "count": count.astype(np.float64)}
+
+
+def _year_frame(arr, years, columns):
+    return pd.DataFrame(arr, index=pd.Index(years, name="year"), columns=columns)
+
+
+# {grup: frame tahun x indikator} dari frame hasil aggregate().
+def split_rollups(rollups):
+    return {group: rollups.xs(group, level="group") for group in rollups.index.unique("group")}
+
+
+# {grup: frame tahun x indikator}, supaya memilih grup sama murahnya dengan
+# memilih satu negara.
+@st.cache_resource(show_spinner=False)
+def load_group_rollups():
+    artifacts = load_artifacts()
+    if artifacts is not None:
+        arr = artifacts.array("rollups")
+        return {
+            group: _year_frame(arr[g], artifacts["years"], artifacts["columns"])
+            for g, group in enumerate(artifacts["groups"])
+        }
+    return split_rollups(build_group_rollups(read_dataset()))
+
+
+def group_names():
+    return list(load_group_rollups())
+
+
+# Statistik tambahan per grup (lihat GROUP_STATS), dari artifact kalau ada.
+@st.cache_resource(show_spinner=False)
+def load_group_stats():
+    artifacts = load_artifacts()
+    if artifacts is not None:
+        arrays = {stat: artifacts.array(f"group_{stat}") for stat in GROUP_STATS}
+        groups, years, columns = artifacts["groups"], artifacts["years"], artifacts["columns"]
+    else:
+        df = read_dataset()
+        groups = list(load_group_rollups())
+        arrays = build_group_stats(df, {group: load_group_members()[group] for group in groups})
+        years = list(range(int(df["year"].min()), int(df["year"].max()) + 1))
+        columns = indicator_columns(df)
+    return {
+        stat: {group: _year_frame(arr[g], years, columns) for g, group in enumerate(groups)}
+        for stat, arr in arrays.items()
+    }
+
+
+# {grup: [negara anggota]} untuk memilih satu peer group sekaligus.
+@st.cache_resource(show_spinner=False)
+def load_group_members():
+    return group_definitions(load_data([]))
+
+
+@instrumented("aggregate.rollup")
+def rollup(group, start, end=None):
+    return load_group_rollups()[group].loc[start:start if end is None else end]
+
+
+@instrumented("aggregate.group_stat")
+def group_stat(group, stat, start, end=None):
+    return load_group_stats()[stat][group].loc[start:start if end is None else end]
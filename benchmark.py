@@ -0,0 +1,223 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from aggregates import WORLDWIDE, aggregate, build_group_rollups, group_definitions, split_rollups
+from comparative import render_panel_html
+from comparison import comparison_matrix, heat_styles, percentile_matrix
+from data_store import BASE_DIR, CountryYearIndex, indicator_columns, parse_csv, read_dataset
+from filters import slice_frame
+from growth import build_growth_table
+from indicator_stats import build_indicator_stats
+from lazy_imports import lazy_import
+from synthetic import SCALES, scaled
+
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+
+HISTORY_PATH = os.path.join(BASE_DIR, "benchmark_history.jsonl")
+REPEAT = 5
+REGRESSION_THRESHOLD = 1.2
+SAMPLE_COUNTRIES = 20
+
+
+def measure(fn, repeat=REPEAT):
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "mean": statistics.fmean(times), "repeat": repeat}
+
+
+# Jalur data (ikut diskalakan): load CSV / cache biner, index, filter,
+# agregasi grup (termasuk Worldwide), growth. Semua memakai fungsi build_* langsung,
+# bukan loader ber-cache, jadi yang terukur = kerja sebenarnya.
+def data_cases(df, workdir):
+    os.makedirs(workdir, exist_ok=True)
+    csv_path = os.path.join(workdir, "dataset.csv")
+    df.to_csv(csv_path, index=False)
+    cache_dir = os.path.join(workdir, "cache")
+    read_dataset(csv_path, cache_dir=cache_dir)
+
+    index = CountryYearIndex(df)
+    rng = np.random.default_rng(0)
+    sample = list(rng.choice(index.countries, size=min(SAMPLE_COUNTRIES, len(index.countries)), replace=False))
+    year_range = (index.first_year + (index.last_year - index.first_year) // 4, index.last_year)
+    groups = group_definitions(df)
+    rollups = split_rollups(build_group_rollups(df, groups))
+
+    return {
+        "load_csv": lambda: parse_csv(csv_path),
+        "load_binary": lambda: read_dataset(csv_path, cache_dir=cache_dir),
+        "index_build": lambda: CountryYearIndex(df),
+        "filter_countries_years": lambda: slice_frame(df, index, sample, year_range),
+        "filter_scan": lambda: df[df["country_name"].isin(sample) & df["year"].between(*year_range)],
+        "worldwide_aggregation": lambda: aggregate(df, {WORLDWIDE: groups[WORLDWIDE]}, index=index),
+        "group_rollups": lambda: build_group_rollups(df, groups),
+        "growth_table": lambda: build_growth_table(df, rollups),
+    }
+
+
+# Jalur render: HTML bar Comparative, tabel perbandingan, dan build figure +
+# serialisasi JSON untuk tiap jenis chart. Memakai df & index yang sama dengan
+# jalur data (bukan loader ber-cache), jadi ikut diskalakan. Statistik
+# (skala bar, korelasi) dibangun sekali di luar yang diukur.
+def render_cases(df, index):
+    from correlation import CorrelationStats
+    from figures import OVERVIEW_CHARTS, comparison_traces, make_figure
+
+    columns = indicator_columns(df)
+    countries = ["Indonesia", "Germany", "Japan", "Brazil"]
+    year_range = (2010, 2023)
+    scales = build_indicator_stats(df).scales(columns)
+    heat_columns = columns[:6]
+    correlation = CorrelationStats(index.countries, index.first_year, heat_columns,
+                                   index.dense(df[heat_columns].to_numpy(dtype=np.float64)))
+
+    def comparative_panels():
+        positions = [index.row(country, 2020) for country in countries]
+        values = df.iloc[positions, df.columns.get_indexer(columns)].to_numpy(dtype=np.float64)
+        return [render_panel_html(row, columns, scales) for row in values]
+
+    def comparison_table():
+        matrix = comparison_matrix(df, index, index.countries, list(range(2019, 2024)), columns)
+        return heat_styles(percentile_matrix(matrix.to_numpy()))
+
+    def overview():
+        frame = slice_frame(df, index, ["Indonesia"], year_range)
+        return [build(frame, frame).to_json() for build in OVERVIEW_CHARTS.values()]
+
+    def comparison(column, title):
+        traces = comparison_traces(df, column, countries, year_range, title, index=index)
+        return make_figure('comparison', title, traces).to_json()
+
+    def panel():
+        data = slice_frame(df, index, countries, year_range, ["Unemployment Rate (%)"])
+        traces = px.line(data, x='year', y='Unemployment Rate (%)', color='country_name', markers=True).data
+        return make_figure('panel', "Unemployment Rate", traces).to_json()
+
+    def heatmap():
+        matrix = correlation.pooled(*year_range)
+        return make_figure('heatmap', "Correlation", [go.Heatmap(z=matrix.values, x=list(matrix.columns), y=list(matrix.index))]).to_json()
+
+    return {
+        "render_bar_html": comparative_panels,
+        "comparison_table": comparison_table,
+        "figure_overview": overview,
+        "figure_interest_rate": lambda: comparison('Interest Rate (Real, %)', 'Interest Rate'),
+        "figure_current_account": lambda: comparison('Current Account Balance (% GDP)', 'Current Account Balance'),
+        "figure_unemployment_panel": panel,
+        "figure_correlation_heatmap": heatmap,
+    }
+
+
+def run(scales=(1, 10, 100), repeat=REPEAT, only=None):
+    base = read_dataset()
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in scales:
+            df = scaled(base, scale)
+            cases = data_cases(df, os.path.join(workdir, f"x{scale}"))
+            cases.update(render_cases(df, CountryYearIndex(df)))
+            for name, fn in cases.items():
+                if only and not any(part in name for part in only):
+                    continue
+                stats = measure(fn, repeat)
+                results.append({"case": name, "scale": scale, "rows": len(df), **stats})
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(results, path=HISTORY_PATH):
+    record = {
+        "timestamp": time.time(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "results": results,
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+# Bandingkan waktu minimum (paling stabil antar run) dengan run terakhir yang
+# punya case + skala yang sama.
+def compare(results, history, threshold=REGRESSION_THRESHOLD):
+    previous = {}
+    for record in history:
+        for r in record["results"]:
+            previous[(r["case"], r["scale"])] = r["min"]
+    rows, regressions = [], []
+    for r in results:
+        before = previous.get((r["case"], r["scale"]))
+        ratio = r["min"] / before if before else None
+        rows.append((r, before, ratio))
+        if ratio is not None and ratio > threshold:
+            regressions.append(r)
+    return rows, regressions
+
+
+def format_table(rows):
+    lines = [f"{'case':<28} {'scale':>5} {'rows':>9} {'median ms':>10} {'min ms':>9} {'vs last':>8}"]
+    for r, _, ratio in rows:
+        change = f"{ratio:.2f}x" if ratio is not None else "-"
+        lines.append(f"{r['case']:<28} {r['scale']:>5} {r['rows']:>9} {r['median'] * 1000:>10.2f} {r['min'] * 1000:>9.2f} {change:>8}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmarks for data and figure paths.")
+    parser.add_argument("--scales", nargs="+", type=int, default=list(SCALES), choices=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--only", nargs="+", help="run cases whose name contains any of these")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--no-record", action="store_true", help="do not append to the history file")
+    parser.add_argument("--check", action="store_true",
+                        help=f"exit 1 if a case is >{REGRESSION_THRESHOLD:.1f}x slower than the last run")
+    args = parser.parse_args(argv)
+
+    # Loader ber-cache dipanggil di luar server Streamlit (bare mode).
+    warnings.filterwarnings("ignore")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    results = run(args.scales, args.repeat, args.only)
+    rows, regressions = compare(results, load_history(args.history))
+    print(format_table(rows))
+    if not args.no_record:
+        append_history(results, args.history)
+    if args.check and regressions:
+        print(f"{len(regressions)} case(s) regressed: {', '.join(r['case'] for r in regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
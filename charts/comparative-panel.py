@@ -1,16 +1,13 @@
 import streamlit as st
 import pandas as pd
 
+from data_store import load_data
+
 st.set_page_config(page_title="Comparative Panel", layout="wide")
 st.title("Comparative Panel")
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv("world_bank_data_2025.csv")
-    return df
-
 data = load_data()
-countries = sorted(data["country_name"].unique())
+countries = list(data["country_name"].cat.categories)
 years = sorted(data["year"].unique())
 
 # Fungsi format angka T, B, M
@@ -1,6 +1,9 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
+
+from data_store import load_data
+from lazy_imports import lazy_import
+
+alt = lazy_import("altair")
 
 # ——————————————————————————————————————————————
 # 0) Page config: wide layout
@@ -11,15 +14,9 @@ st.set_page_config(
 )
 
 # ——————————————————————————————————————————————
-# 1) Load & cache data
+# 1) Load data (shared store)
 # ——————————————————————————————————————————————
-@st.cache_data
-def load_data():
-    df = pd.read_csv("world_bank_data_2025.csv")
-    df["year"] = df["year"].astype(int)
-    return df
-
-df = load_data()
+df = load_data(["Government Revenue (% of GDP)"])
 
 # ——————————————————————————————————————————————
 # 2) Top Filters (container penuh di atas)
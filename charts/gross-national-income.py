@@ -1,22 +1,22 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from data_store import load_data
+from downsample import downsample_frame
+from figures import max_points
+from lazy_imports import lazy_import
+
+px = lazy_import("plotly.express")
 
 st.set_page_config(page_title="Gross National Income", layout="wide")
 st.title("Gross National Income (GNI)")
 
 # Load dataset
-@st.cache_data
-def load_data():
-    df = pd.read_csv("charts/world_bank_data_2025.csv")
-    return df
-
-data = load_data()
+data = load_data(["Gross National Income (USD)"])
 
 # Multi-pilih negara & rentang tahun
 col_country, col_year = st.columns([2, 3])
 with col_country:
-    countries = sorted(data["country_name"].unique())
+    countries = list(data["country_name"].cat.categories)
     selected_countries = st.multiselect(
         "Select Countries",
         countries,
@@ -44,8 +44,10 @@ df_filtered = data[
 # Grafik GNI time-series untuk tiap negara
 st.subheader(f"GNI Trend ({start_year}–{end_year})")
 
+# Seri panjang dipangkas ke ~lebar chart sebelum dikirim ke browser
+gni_chart_data = downsample_frame(df_filtered, "year", "Gross National Income (USD)", "country_name", max_points("panel"))
 fig_gni = px.line(
-    df_filtered.sort_values("year"),
+    gni_chart_data.sort_values("year"),
     x="year",
     y="Gross National Income (USD)",
     color="country_name",
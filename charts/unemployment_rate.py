@@ -1,19 +1,20 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 
-# Load data
-df = pd.read_csv('D:/SEMESTER 6/Global Economic/word_bank_data_clean.csv')
+from data_store import load_data
+from filters import filter_frame
+from downsample import downsample_frame
+from figures import make_figure, max_points, show_figure
+from growth import load_growth
+from lazy_imports import lazy_import
 
-# Set page config
-st.set_page_config(page_title="Economic Dashboard", layout="wide")
+px = lazy_import("plotly.express")
 
-# Pastikan kolom tahun bertipe integer dan bersih dari nilai desimal
-df['year'] = pd.to_numeric(df['year'], errors='coerce')
-df['year'] = df['year'].round().astype(int)
+# Load data (tipe & rentang tahun sudah divalidasi di data_store)
+df = load_data(['GDP per Capita (Current USD)', 'Unemployment Rate (%)'])
 
-# Filter hanya tahun yang valid (misalnya antara 1960-2030)
-df = df[(df['year'] >= 1960) & (df['year'] <= 2030)]
+# Set page config
+st.set_page_config(page_title="Economic Dashboard", layout="wide")
 
 # Title
 st.markdown("<h1 style='color:white;'>Economic Overview Dashboard</h1>", unsafe_allow_html=True)
@@ -51,12 +52,8 @@ if not selected_countries:
 
 st.markdown("---")
 
-# Filter data by selected countries and year range
-filtered_data = df[
-    (df['country_name'].isin(selected_countries)) & 
-    (df['year'] >= year_range[0]) & 
-    (df['year'] <= year_range[1])
-].copy()
+# Filter data by selected countries and year range (di-memo lintas rerun/session)
+filtered_data = filter_frame(df, selected_countries, year_range)
 
 # Jika tidak ada data, tampilkan pesan
 if filtered_data.empty:
@@ -75,7 +72,7 @@ else:
     metric_cols = st.columns(min(4, num_countries))
 
 for i, country in enumerate(selected_countries):
-    country_data = filtered_data[filtered_data['country_name'] == country]
+    country_data = filter_frame(df, [country], year_range)
     
     if not country_data.empty:
         latest_year_data = country_data[country_data['year'] == country_data['year'].max()]
@@ -119,17 +116,16 @@ st.markdown("---")
 st.markdown("### 📈 Unemployment Rate Trends")
 
 unemp_col = 'Unemployment Rate (%)'
-unemp_chart_data = filtered_data.dropna(subset=[unemp_col])
+unemp_chart_data = downsample_frame(filtered_data.dropna(subset=[unemp_col]), 'year', unemp_col, 'country_name', max_points('panel'))
 
 if not unemp_chart_data.empty:
-    fig1 = px.line(
-        unemp_chart_data,
-        x='year',
-        y=unemp_col,
-        color='country_name',
-        title=f"Unemployment Rate Comparison ({year_range[0]}–{year_range[1]})",
-        markers=True,
-        line_shape='linear'
+    fig1 = make_figure(
+        'panel',
+        f"Unemployment Rate Comparison ({year_range[0]}–{year_range[1]})",
+        px.line(unemp_chart_data, x='year', y=unemp_col, color='country_name', markers=True, line_shape='linear').data,
+        yaxis_title="Unemployment Rate (%)",
+        xaxis_range=[year_range[0] - 0.5, year_range[1] + 0.5],
+        xaxis_dtick=1 if (year_range[1] - year_range[0]) <= 15 else 2
     )
     
     # Styling untuk unemployment chart
@@ -140,37 +136,7 @@ if not unemp_chart_data.empty:
         hovertemplate='<b>%{fullData.name}</b><br>Year: %{x}<br>Unemployment Rate: %{y:.2f}%<extra></extra>'
     )
     
-    fig1.update_layout(
-        hovermode='x unified',
-        plot_bgcolor="#0E1117",
-        paper_bgcolor="#0E1117",
-        font=dict(color="white"),
-        title_font=dict(size=18, color="white"),
-        xaxis_title="Year",
-        yaxis_title="Unemployment Rate (%)",
-        legend_title="Country",
-        xaxis=dict(
-            color="white",
-            showgrid=True,
-            gridcolor="rgba(255,255,255,0.1)",
-            range=[year_range[0] - 0.5, year_range[1] + 0.5],
-            dtick=1 if (year_range[1] - year_range[0]) <= 15 else 2
-        ),
-        yaxis=dict(
-            color="white",
-            showgrid=True,
-            gridcolor="rgba(255,255,255,0.1)"
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
-    
-    st.plotly_chart(fig1, use_container_width=True)
+    show_figure(fig1)
 else:
     st.warning(f"⚠️ No unemployment data available for selected countries in the year range.")
 
@@ -178,17 +144,16 @@ else:
 st.markdown("### 💹 GDP per Capita Trends")
 
 gdp_col = 'GDP per Capita (Current USD)'
-gdp_chart_data = filtered_data.dropna(subset=[gdp_col])
+gdp_chart_data = downsample_frame(filtered_data.dropna(subset=[gdp_col]), 'year', gdp_col, 'country_name', max_points('panel'))
 
 if not gdp_chart_data.empty:
-    fig2 = px.line(
-        gdp_chart_data,
-        x='year',
-        y=gdp_col,
-        color='country_name',
-        title=f"GDP per Capita Comparison ({year_range[0]}–{year_range[1]})",
-        markers=True,
-        line_shape='linear'
+    fig2 = make_figure(
+        'panel',
+        f"GDP per Capita Comparison ({year_range[0]}–{year_range[1]})",
+        px.line(gdp_chart_data, x='year', y=gdp_col, color='country_name', markers=True, line_shape='linear').data,
+        yaxis_title="GDP per Capita (USD)",
+        xaxis_range=[year_range[0] - 0.5, year_range[1] + 0.5],
+        xaxis_dtick=1 if (year_range[1] - year_range[0]) <= 15 else 2
     )
     
     # Styling untuk GDP chart
@@ -199,37 +164,7 @@ if not gdp_chart_data.empty:
         hovertemplate='<b>%{fullData.name}</b><br>Year: %{x}<br>GDP per Capita: $%{y:,.0f}<extra></extra>'
     )
     
-    fig2.update_layout(
-        hovermode='x unified',
-        plot_bgcolor="#0E1117",
-        paper_bgcolor="#0E1117",
-        font=dict(color="white"),
-        title_font=dict(size=18, color="white"),
-        xaxis_title="Year",
-        yaxis_title="GDP per Capita (USD)",
-        legend_title="Country",
-        xaxis=dict(
-            color="white",
-            showgrid=True,
-            gridcolor="rgba(255,255,255,0.1)",
-            range=[year_range[0] - 0.5, year_range[1] + 0.5],
-            dtick=1 if (year_range[1] - year_range[0]) <= 15 else 2
-        ),
-        yaxis=dict(
-            color="white",
-            showgrid=True,
-            gridcolor="rgba(255,255,255,0.1)"
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
-    
-    st.plotly_chart(fig2, use_container_width=True)
+    show_figure(fig2)
 else:
     st.warning(f"⚠️ No GDP data available for selected countries in the year range.")
 
@@ -243,7 +178,7 @@ if len(selected_countries) > 1:
         st.markdown("**📊 Average Statistics**")
         
         for country in selected_countries:
-            country_data = filtered_data[filtered_data['country_name'] == country]
+            country_data = filter_frame(df, [country], year_range)
             
             if not country_data.empty:
                 avg_gdp = country_data[gdp_col].mean()
@@ -257,17 +192,19 @@ if len(selected_countries) > 1:
     with col_analysis2:
         st.markdown("**📈 Growth Analysis**")
         
+        # Perubahan total & CAGR untuk semua negara dihitung dari tabel growth
+        growth = load_growth()
+        start_year = max(year_range[0], growth.first_year)
+        end_year = min(year_range[1], growth.last_year)
+
         for country in selected_countries:
-            country_data = filtered_data[filtered_data['country_name'] == country].sort_values('year')
+            growth_rate = growth.period_change_of(country, gdp_col, start_year, end_year)
+            cagr = growth.cagr_of(country, gdp_col, start_year, end_year)
             
-            if len(country_data) > 1:
-                first_year_gdp = country_data[gdp_col].iloc[0]
-                last_year_gdp = country_data[gdp_col].iloc[-1]
-                
-                if pd.notna(first_year_gdp) and pd.notna(last_year_gdp) and first_year_gdp > 0:
-                    growth_rate = ((last_year_gdp - first_year_gdp) / first_year_gdp) * 100
-                    
-                    st.write(f"**{country}:**")
-                    st.write(f"• GDP Growth: {growth_rate:+.1f}%")
-                    st.write(f"• Period: {country_data['year'].iloc[0]} - {country_data['year'].iloc[-1]}")
-                    st.write("---")
\ No newline at end of file
+            if pd.notna(growth_rate):
+                st.write(f"**{country}:**")
+                st.write(f"• GDP Growth: {growth_rate:+.1f}%")
+                if pd.notna(cagr):
+                    st.write(f"• CAGR: {cagr:+.2f}% / year")
+                st.write(f"• Period: {start_year} - {end_year}")
+                st.write("---")
\ No newline at end of file
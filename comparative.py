@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from indicator_stats import load_indicator_stats
+
+
+# Fungsi format angka T, B, M
+def format_number(val):
+    if pd.isna(val):
+        return "N/A"
+    elif val >= 1e12:
+        return f"{val / 1e12:.2f} T"
+    elif val >= 1e9:
+        return f"{val / 1e9:.2f} B"
+    elif val >= 1e6:
+        return f"{val / 1e6:.2f} M"
+    else:
+        return f"{val:,.0f}"
+
+
+# Template satu bar indikator (tanpa indentasi, supaya aman digabung dalam
+# satu blok markdown).
+_BAR_TEMPLATE = (
+    '<div style="margin-bottom:16px">'
+    "<div style='display: flex; justify-content: space-between; font-size:0.85rem; margin-bottom:4px;'>"
+    "<span>{label}</span><span>{value_text}</span></div>"
+    '<div style="background-color:#e0e0e0;width:100%;height:12px;border-radius:4px;overflow:hidden;">'
+    '<div style="background-color:{bar_color};width:{bar_width}%;height:100%"></div></div>'
+    "<div style='display: flex; justify-content: space-between; font-size:0.75rem; color: #888; margin-top:2px'>"
+    "<span>0%</span><span>{max_label}</span></div>"
+    "</div>"
+)
+_NUMBER_TEMPLATE = "<p><strong>{label}:</strong> {value_text}</p>"
+_OVER_MARK = " <span title='Exceeds scale'>⚠️</span>"
+
+
+# Fungsi buat bar indikator
+def render_bar(value, max_value=100, label=""):
+    return render_bars([value], [max_value], [label])
+
+
+# Banyak bar sekaligus: lebar, warna, dan status "melebihi skala" dihitung
+# vektor dengan numpy, lalu HTML-nya digabung jadi satu string.
+def render_bars(values, max_values, labels):
+    values = np.asarray(values, dtype=np.float64)
+    max_values = np.asarray(max_values, dtype=np.float64)
+    missing = np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        over = ~missing & (values > max_values)
+        widths = np.where(missing, 0.0, np.minimum(values / max_values, 1.0) * 100)
+    return "".join(
+        _BAR_TEMPLATE.format(
+            label=label,
+            value_text="N/A" if nan else f"{value:.2f}%",
+            bar_color="#f28e69" if is_over else "#69b3f2",
+            bar_width=width,
+            max_label=f"Max: {max_value:.0f}%" + (_OVER_MARK if is_over else ""),
+        )
+        for label, value, max_value, width, nan, is_over
+        in zip(labels, values, max_values, widths, missing, over)
+    )
+
+
+# Blok indikator satu panel dari array nilai (urut sesuai columns): indikator
+# angka dulu, lalu bar. Satu string -> satu st.markdown per panel, berapa pun
+# jumlah indikator yang dipilih.
+def render_panel_html(values, columns, scales):
+    values = np.asarray(values, dtype=np.float64)
+    numeric = np.array([is_numeric_only(col) for col in columns], dtype=bool)
+    numbers = "".join(
+        _NUMBER_TEMPLATE.format(label=col, value_text=format_number(value))
+        for col, value in zip(np.asarray(columns, dtype=object)[numeric], values[numeric])
+    )
+    bar_columns = [col for col, is_number in zip(columns, numeric) if not is_number]
+    bars = render_bars(values[~numeric], [scales.get(col, 100) for col in bar_columns], bar_columns)
+    return numbers + bars
+
+
+# Tentukan mana indikator angka dan mana yang bar (% / rasio)
+def is_numeric_only(col):
+    return "USD" in col or "Income" in col or ("GDP" in col and "%" not in col)
+
+
+# max_value bar per kolom: batas atas rentang tampilan robust (p99 + headroom)
+# dari statistik indikator yang dihitung sekali saat load.
+def bar_scales(columns, year=None):
+    return load_indicator_stats().scales(columns, year)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import instrumented
+
+# Mesin perbandingan kolumnar untuk mode tabel Comparative: banyak pasangan
+# (negara, tahun) sekaligus. Semua baris diambil dalam satu fetch ber-index
+# jadi matriks padat seleksi x indikator, lalu peringkat & persentil dihitung
+# vektor untuk seluruh matriks (bukan per panel / per indikator).
+MAX_SELECTIONS = 1000
+HEAT_LOW = np.array([0xf2, 0x8e, 0x69])   # persentil 0 (sama dengan bar "over")
+HEAT_MID = np.array([0x2a, 0x46, 0x64])   # persentil 50 (BACKGROUND_COLOR)
+HEAT_HIGH = np.array([0x69, 0xb3, 0xf2])  # persentil 100 (sama dengan bar)
+
+
+# Pasangan (negara, tahun) yang ada datanya, urut negara lalu tahun, beserta
+# posisi barisnya.
+def selection_positions(index, countries, years):
+    grid = index.grid(countries, years)
+    c, y = np.nonzero(grid >= 0)
+    return np.asarray(countries, dtype=object)[c], np.asarray(years)[y], grid[c, y]
+
+
+# Matriks seleksi x indikator (float64) dengan index (country, year).
+@instrumented("comparison.matrix")
+def comparison_matrix(data, index, countries, years, columns):
+    names, sel_years, pos = selection_positions(index, countries, years)
+    values = data.iloc[pos, data.columns.get_indexer(columns)].to_numpy(dtype=np.float64)
+    return pd.DataFrame(values, columns=list(columns),
+                        index=pd.MultiIndex.from_arrays([names, sel_years], names=["country", "year"]))
+
+
+# Peringkat per kolom (1 = nilai tertinggi, seri dapat peringkat yang sama),
+# NaN tetap NaN. Satu argsort untuk seluruh matriks.
+@instrumented("comparison.rank")
+def rank_matrix(values):
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[0]
+    missing = np.isnan(values)
+    filled = np.where(missing, -np.inf, values)
+    order = np.argsort(-filled, axis=0, kind="stable")
+    ordered = np.take_along_axis(filled, order, axis=0)
+    steps = np.arange(n)[:, None] * np.ones((1, values.shape[1]), dtype=np.int64)
+    new_value = np.ones(ordered.shape, dtype=bool)
+    new_value[1:] = ordered[1:] != ordered[:-1]
+    first = np.maximum.accumulate(np.where(new_value, steps, 0), axis=0)
+    ranks = np.empty(values.shape, dtype=np.float64)
+    np.put_along_axis(ranks, order, first + 1.0, axis=0)
+    ranks[missing] = np.nan
+    return ranks
+
+
+# Persentil (0-100) posisi tiap seleksi di kolomnya: 100 = tertinggi,
+# 0 = terendah. Kolom dengan satu nilai saja -> 50.
+def percentile_matrix(values, ranks=None):
+    values = np.asarray(values, dtype=np.float64)
+    ranks = rank_matrix(values) if ranks is None else ranks
+    valid = (~np.isnan(values)).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = np.where(valid > 1, (valid - ranks) / (valid - 1) * 100, 50.0)
+    pct[np.isnan(values)] = np.nan
+    return pct
+
+
+# Warna latar heatmap per sel dari matriks persentil (interpolasi linear
+# rendah -> tengah -> tinggi), sebagai CSS untuk Styler.
+def heat_styles(pct):
+    pct = np.asarray(pct, dtype=np.float64)
+    t = np.clip(np.nan_to_num(pct, nan=50.0) / 50.0, 0.0, 2.0)[..., None]
+    rgb = np.where(t <= 1, HEAT_LOW + (HEAT_MID - HEAT_LOW) * t, HEAT_MID + (HEAT_HIGH - HEAT_MID) * (t - 1))
+    rgb = np.rint(rgb).astype(np.int64)
+    hex_colors = np.char.add("#", np.char.add(np.char.add(
+        np.char.zfill(np.char.mod("%x", rgb[..., 0]), 2),
+        np.char.zfill(np.char.mod("%x", rgb[..., 1]), 2)),
+        np.char.zfill(np.char.mod("%x", rgb[..., 2]), 2)))
+    styles = np.char.add(np.char.add("background-color: ", hex_colors), "; color: white")
+    return np.where(np.isnan(pct), "", styles)
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from data_store import load_index
+from filters import memoize
+from growth import load_growth
+from instrumentation import instrumented
+
+MIN_OBSERVATIONS = 3
+STATS = ["n", "sx", "sxx", "sxy"]
+
+
+# Statistik cukup (sufficient statistics) korelasi berpasangan per negara per
+# tahun, disimpan sebagai prefix sum di sumbu tahun. Statistik untuk rentang
+# tahun mana pun = prefix[end + 1] - prefix[start], jadi rentang yang overlap
+# tidak perlu menyentuh data mentah lagi. NaN ditangani pairwise-complete:
+# pasangan (i, j) hanya memakai observasi yang punya kedua nilai.
+#   n[i, j]   = jumlah observasi lengkap
+#   sx[i, j]  = jumlah x_i pada observasi itu (sy = sx transpos)
+#   sxx[i, j] = jumlah x_i^2                 (syy = sxx transpos)
+#   sxy[i, j] = jumlah x_i * x_j
+class CorrelationStats:
+    def __init__(self, names, first_year, columns, values):
+        self.names = list(names)
+        self.first_year = first_year
+        self.last_year = first_year + values.shape[1] - 1
+        self.columns = list(columns)
+        self._name_pos = {name: i for i, name in enumerate(self.names)}
+        self._col_pos = {col: k for k, col in enumerate(self.columns)}
+
+        valid = ~np.isnan(values)
+        x = np.where(valid, values, 0.0)
+        pair = (valid[..., :, None] & valid[..., None, :]).astype(np.float64)
+        per_year = {
+            "n": pair,
+            "sx": x[..., :, None] * pair,
+            "sxx": (x ** 2)[..., :, None] * pair,
+            "sxy": x[..., :, None] * x[..., None, :],
+        }
+        self.prefix = {}
+        for stat, arr in per_year.items():
+            prefix = np.zeros((arr.shape[0], arr.shape[1] + 1) + arr.shape[2:])
+            np.cumsum(arr, axis=1, out=prefix[:, 1:])
+            self.prefix[stat] = prefix
+
+    # Ukuran sebenarnya (prefix array), supaya batas byte LRU bersama berlaku.
+    @property
+    def nbytes(self):
+        return sum(p.nbytes for p in self.prefix.values())
+
+    # Posisi kolom sesuai urutan yang diminta pemanggil (default: urutan stats).
+    def _positions(self, columns=None):
+        columns = self.columns if columns is None else list(columns)
+        return columns, [self._col_pos[col] for col in columns]
+
+    def _window(self, start, end):
+        start = max(int(start), self.first_year) - self.first_year
+        end = min(int(end), self.last_year) - self.first_year + 1
+        return start, max(end, start)
+
+    # Statistik per negara untuk rentang tahun: dict stat -> C x K x K.
+    def range_stats(self, start, end):
+        lo, hi = self._window(start, end)
+        return {stat: p[:, hi] - p[:, lo] for stat, p in self.prefix.items()}
+
+    def per_country(self, start, end):
+        return correlation_from_stats(self.range_stats(start, end))
+
+    # Semua observasi (negara, tahun) digabung.
+    def pooled(self, start, end, columns=None):
+        columns, pos = self._positions(columns)
+        stats = {stat: arr.sum(axis=0) for stat, arr in self.range_stats(start, end).items()}
+        corr = correlation_from_stats(stats)[np.ix_(pos, pos)]
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def country_matrix(self, name, start, end, columns=None):
+        columns, pos = self._positions(columns)
+        i = self._name_pos[name]
+        return pd.DataFrame(self.per_country(start, end)[i][np.ix_(pos, pos)], index=columns, columns=columns)
+
+    # Satu baris per negara, satu kolom per pasangan indikator.
+    def pair_table(self, start, end, columns=None):
+        columns, pos = self._positions(columns)
+        corr = self.per_country(start, end)
+        pairs = [(a, b) for a in range(len(columns)) for b in range(a + 1, len(columns))]
+        return pd.DataFrame(
+            {f"{columns[a]} vs {columns[b]}": corr[:, pos[a], pos[b]] for a, b in pairs},
+            index=pd.Index(self.names, name="country_name"),
+        )
+
+
+def correlation_from_stats(stats):
+    n, sx, sxx, sxy = (stats[stat] for stat in STATS)
+    sy = np.swapaxes(sx, -1, -2)
+    syy = np.swapaxes(sxx, -1, -2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx ** 2 / n
+        var_y = syy - sy ** 2 / n
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[(n < MIN_OBSERVATIONS) | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+# Statistik dibangun sekali per set indikator (array negara dari tabel growth
+# yang sudah ada) dan disimpan di LRU bersama, begitu juga hasil per rentang.
+# Kunci = set indikator terurut (seperti filter_key): urutan pilihan yang
+# berbeda memakai stats yang sama; hasil disusun ulang sesuai urutan pilihan.
+def correlation_key(indicators):
+    return tuple(sorted(set(indicators)))
+
+
+@instrumented("aggregate.correlation_stats")
+def load_correlation_stats(indicators):
+    indicators = correlation_key(indicators)
+
+    def compute():
+        growth = load_growth()
+        countries = load_index().countries
+        cols = [growth.columns.index(col) for col in indicators]
+        values = growth.values[:len(countries)][:, :, cols]
+        return CorrelationStats(countries, growth.first_year, indicators, values)
+
+    return memoize("correlation_stats", indicators, compute)
+
+
+@instrumented("aggregate.correlation")
+def pooled_correlation(indicators, start, end):
+    stats = load_correlation_stats(indicators)
+    columns = list(dict.fromkeys(indicators))
+    return memoize("correlation_pooled", (tuple(columns), int(start), int(end)), lambda: stats.pooled(start, end, columns))
+
+
+@instrumented("aggregate.correlation")
+def country_pair_table(indicators, start, end):
+    stats = load_correlation_stats(indicators)
+    columns = list(dict.fromkeys(indicators))
+    return memoize("correlation_pairs", (tuple(columns), int(start), int(end)), lambda: stats.pair_table(start, end, columns))
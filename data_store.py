@@ -0,0 +1,346 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+import streamlit as st
+
+from instrumentation import instrumented
+
+# Frame hasil load dipakai bersama oleh semua session, jadi turunan (filter,
+# slice) tidak boleh bisa menulis balik ke frame asli.
+pd.set_option("mode.copy_on_write", True)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.environ.get("DASHBOARD_DATA_PATH", os.path.join(BASE_DIR, "data", "world_bank_data.csv"))
+GROUPS_PATH = os.path.join(BASE_DIR, "data", "country_groups.csv")
+CACHE_DIR = os.path.join(BASE_DIR, "data", ".cache")
+ARTIFACT_DIR = os.environ.get("DASHBOARD_ARTIFACT_DIR", os.path.join(BASE_DIR, "data", "artifacts"))
+
+ID_COLUMNS = ["country_name", "country_id", "year"]
+
+# Skema tabel indikator di memori. Indikator persen/rasio cukup float32 (nilai
+# dua digit desimal); level USD (GDP sampai ~1e14) tetap float64. Naikkan
+# SCHEMA_VERSION kalau skema berubah supaya cache biner lama tidak dipakai.
+SCHEMA_VERSION = 3
+# Naikkan kalau isi/format artifact precompute berubah.
+ARTIFACT_VERSION = 4
+ID_DTYPES = {"country_name": "category", "country_id": "category", "year": "int16"}
+YEAR_BOUNDS = (1900, 2100)
+
+
+def indicator_dtype(col):
+    return "float32" if "%" in col else "float64"
+
+
+class SchemaError(ValueError):
+    pass
+
+
+# Validasi sekali saat load (sebelum ditulis ke cache), bukan per halaman.
+def validate_dataset(df):
+    missing = [col for col in ID_COLUMNS if col not in df.columns]
+    if missing:
+        raise SchemaError(f"Missing columns: {missing}")
+    if df[ID_COLUMNS].isna().any().any():
+        raise SchemaError("country_name, country_id and year must not be empty")
+
+    years = pd.to_numeric(df["year"], errors="coerce")
+    if years.isna().any() or (years != years.round()).any():
+        raise SchemaError("year must contain whole numbers")
+    if years.min() < YEAR_BOUNDS[0] or years.max() > YEAR_BOUNDS[1]:
+        raise SchemaError(f"year outside {YEAR_BOUNDS[0]}-{YEAR_BOUNDS[1]}")
+    if df.duplicated(["country_name", "year"]).any():
+        raise SchemaError("Duplicate (country_name, year) rows")
+
+    for col in df.columns:
+        if col not in ID_COLUMNS and not pd.api.types.is_numeric_dtype(df[col]):
+            raise SchemaError(f"Indicator column {col!r} is not numeric")
+
+
+# Indikator level (USD, bukan %): nilai placeholder di CSV sumber dibuang
+# (jadi NaN) sekali saat load, sebelum jadi suku penjumlahan atau bobot
+# agregasi. Sumber mengisi beberapa negara kecil dengan total dunia
+# (mis. GDP 1.06e14, GDP per kapita dunia), jadi:
+#   - nilai level yang persis sama di >= PLACEHOLDER_REPEATS negara pada
+#     tahun yang sama dianggap isian, bukan data negara;
+#   - GDP yang, dibagi GDP per kapita, menyiratkan populasi di atas populasi
+#     dunia dianggap tidak masuk akal.
+PLACEHOLDER_REPEATS = 3
+WORLD_POPULATION = 8.2e9
+GDP_COLUMN = "GDP (Current USD)"
+GDP_PER_CAPITA_COLUMN = "GDP per Capita (Current USD)"
+
+
+def is_level_column(col):
+    return "%" not in col
+
+
+def drop_placeholder_levels(df):
+    levels = [col for col in df.columns if col not in ID_COLUMNS and is_level_column(col)]
+    if not levels:
+        return df
+    df = df.copy()
+    for col in levels:
+        counts = df.groupby(["year", col])[col].transform("size")
+        df.loc[counts >= PLACEHOLDER_REPEATS, col] = np.nan
+    if GDP_COLUMN in df.columns and GDP_PER_CAPITA_COLUMN in df.columns:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            implied_population = df[GDP_COLUMN] / df[GDP_PER_CAPITA_COLUMN]
+        df.loc[implied_population > WORLD_POPULATION, GDP_COLUMN] = np.nan
+    return df
+
+
+def apply_schema(df):
+    dtypes = dict(ID_DTYPES)
+    dtypes.update({col: indicator_dtype(col) for col in df.columns if col not in ID_COLUMNS})
+    return df.astype(dtypes)
+
+
+# File sumber boleh CSV, Parquet, atau Arrow/Feather (mis. output synthetic.py);
+# validasi & skema tetap sama untuk semuanya.
+def read_source(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext in (".arrow", ".feather"):
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+def parse_csv(path=DATA_PATH):
+    df = read_source(path)
+    validate_dataset(df)
+    df = apply_schema(drop_placeholder_levels(df))
+    return df.sort_values(["country_name", "year"], ignore_index=True)
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Nama file sementara unik per proses & thread: konversi paralel (beberapa
+# worker, atau beberapa set kolom di satu proses) tidak saling menimpa file
+# setengah jadi; os.replace-nya tetap atomik.
+def _tmp_name(path):
+    return f"{path}.tmp{os.getpid()}-{threading.get_ident()}"
+
+
+# Pastikan ada file Arrow IPC (Feather v2, tanpa kompresi supaya bisa di-mmap)
+# yang sesuai dengan isi CSV. mtime + size dicek dulu; hash hanya dihitung
+# kalau keduanya berubah, jadi sekadar `touch` tidak memicu konversi ulang.
+def ensure_binary_cache(path=DATA_PATH, cache_dir=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(path))[0]
+    meta_path = os.path.join(cache_dir, f"{name}.json")
+    stat = os.stat(path)
+    meta = _read_meta(meta_path)
+
+    cached = os.path.join(cache_dir, meta.get("file", ""))
+    fresh = meta.get("schema") == SCHEMA_VERSION
+    if fresh and meta.get("mtime_ns") == stat.st_mtime_ns and meta.get("size") == stat.st_size and os.path.isfile(cached):
+        return cached
+
+    digest = _file_digest(path)
+    cached = os.path.join(cache_dir, f"{name}.{digest[:16]}.v{SCHEMA_VERSION}.arrow")
+    if not fresh or meta.get("sha256") != digest or not os.path.isfile(cached):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = _tmp_name(cached)
+        try:
+            feather.write_feather(parse_csv(path), tmp_path, compression="uncompressed")
+            os.replace(tmp_path, cached)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if meta.get("file") and meta["file"] != os.path.basename(cached):
+            try:
+                os.remove(os.path.join(cache_dir, meta["file"]))
+            except OSError:
+                pass
+
+    meta = {"file": os.path.basename(cached), "sha256": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "schema": SCHEMA_VERSION}
+    tmp_meta = _tmp_name(meta_path)
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path)
+    return cached
+
+
+# columns=None -> semua kolom. Kolom ID selalu ikut.
+def read_dataset(path=DATA_PATH, columns=None, cache_dir=CACHE_DIR):
+    if columns is not None:
+        columns = ID_COLUMNS + [col for col in columns if col not in ID_COLUMNS]
+    try:
+        cached = ensure_binary_cache(path, cache_dir)
+    except OSError:
+        # Direktori data read-only: tetap jalan, hanya tanpa cache biner.
+        df = parse_csv(path)
+        return df if columns is None else df[columns]
+    table = feather.read_table(cached, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+# Posisi baris (iloc) per (negara, tahun) dalam array padat negara x tahun,
+# -1 kalau tidak ada datanya. Lookup jadi O(1) tanpa scan kolom.
+class CountryYearIndex:
+    def __init__(self, df):
+        years = df["year"].to_numpy()
+        first_year = int(years.min())
+        countries = list(df["country_name"].cat.categories)
+        codes = df["country_name"].cat.codes.to_numpy()
+        positions = np.full((len(countries), int(years.max()) - first_year + 1), -1, dtype=np.int64)
+        positions[codes, years - first_year] = np.arange(len(df))
+        self._init(countries, first_year, positions)
+
+    def _init(self, countries, first_year, positions):
+        self.countries = list(countries)
+        self.first_year = int(first_year)
+        self.last_year = self.first_year + positions.shape[1] - 1
+        self.positions = positions
+        self._country_pos = {country: i for i, country in enumerate(self.countries)}
+
+    # Dari array posisi yang sudah jadi (artifact precompute).
+    @classmethod
+    def from_arrays(cls, countries, first_year, positions):
+        index = cls.__new__(cls)
+        index._init(countries, first_year, positions)
+        return index
+
+    def _year_slice(self, start, end):
+        start = max(int(start), self.first_year) - self.first_year
+        end = min(int(end), self.last_year) - self.first_year
+        return slice(start, max(end + 1, start))
+
+    def country_positions(self, countries):
+        pos = [self._country_pos.get(country) for country in countries]
+        return np.array([p for p in pos if p is not None], dtype=np.int64)
+
+    # Susun kolom-kolom frame jadi array padat negara x tahun x kolom (NaN
+    # untuk pasangan yang tidak ada).
+    def dense(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        out = np.full(self.positions.shape + (values.shape[1],), np.nan)
+        present = self.positions >= 0
+        out[present] = values[self.positions[present]]
+        return out
+
+    def row(self, country, year):
+        i = self._country_pos.get(country)
+        if i is None or not self.first_year <= year <= self.last_year:
+            return -1
+        return int(self.positions[i, int(year) - self.first_year])
+
+    def rows(self, country, start, end):
+        i = self._country_pos.get(country)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        pos = self.positions[i, self._year_slice(start, end)]
+        return pos[pos >= 0]
+
+    # Posisi baris untuk semua kombinasi negara x tahun sebagai matriks
+    # len(countries) x len(years); -1 kalau tidak ada datanya.
+    def grid(self, countries, years):
+        country_pos = np.array([self._country_pos.get(country, -1) for country in countries], dtype=np.int64)
+        year_pos = np.asarray(years, dtype=np.int64) - self.first_year
+        year_pos = np.where((year_pos >= 0) & (year_pos < self.positions.shape[1]), year_pos, -1)
+        out = self.positions[country_pos[:, None], year_pos[None, :]]
+        out[(country_pos[:, None] < 0) | (year_pos[None, :] < 0)] = -1
+        return out
+
+
+def indicator_columns(df):
+    return [col for col in df.columns if col not in ID_COLUMNS and pd.api.types.is_numeric_dtype(df[col])]
+
+
+# Satu frame per proses (bukan per session / per rerun) untuk tiap set kolom.
+# Anggap read-only.
+@st.cache_resource(show_spinner=False)
+def _load_frame(columns):
+    return read_dataset(columns=None if columns is None else list(columns))
+
+
+@instrumented("load.data")
+def load_data(columns=None):
+    return _load_frame(None if columns is None else tuple(columns))
+
+
+# Urutan baris sama untuk semua set kolom, jadi satu index cukup per proses.
+@instrumented("load.index")
+@st.cache_resource(show_spinner=False)
+def load_index():
+    artifacts = load_artifacts()
+    if artifacts is not None:
+        return CountryYearIndex.from_arrays(artifacts["countries"], artifacts["first_year"], artifacts.array("positions"))
+    return CountryYearIndex(load_data([]))
+
+
+# ======================================
+# Artifact precompute (lihat precompute.py)
+# ======================================
+# Satu direktori per versi di ARTIFACT_DIR: manifest.json + satu .npy per
+# array. File CURRENT berisi nama versi yang aktif. Versi hanya dipakai kalau
+# file sumber (dataset + country_groups.csv) masih sama dengan saat dibangun.
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return {"sha256": _file_digest(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _source_matches(path, recorded):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if recorded.get("mtime_ns") == stat.st_mtime_ns and recorded.get("size") == stat.st_size:
+        return True
+    return recorded.get("sha256") == _file_digest(path)
+
+
+class ArtifactStore:
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+
+    def __getitem__(self, key):
+        return self.manifest[key]
+
+    # Array read-only yang di-mmap; halaman OS dibagi antar worker.
+    def array(self, name):
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+
+
+def open_artifacts(root=ARTIFACT_DIR, sources=None):
+    sources = sources if sources is not None else {"data": DATA_PATH, "groups": GROUPS_PATH}
+    try:
+        with open(os.path.join(root, "CURRENT")) as f:
+            path = os.path.join(root, f.read().strip())
+    except OSError:
+        return None
+    manifest = _read_meta(os.path.join(path, "manifest.json"))
+    if manifest.get("version") != ARTIFACT_VERSION or manifest.get("schema") != SCHEMA_VERSION:
+        return None
+    recorded = manifest.get("sources", {})
+    if set(recorded) != set(sources) or not all(_source_matches(p, recorded[k]) for k, p in sources.items()):
+        return None
+    return ArtifactStore(path, manifest)
+
+
+# None -> belum ada artifact yang cocok; loader menghitung sendiri seperti biasa.
+@st.cache_resource(show_spinner=False)
+def load_artifacts():
+    return open_artifacts()
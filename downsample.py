@@ -0,0 +1,100 @@
+import numpy as np
+
+METHODS = ["lttb", "minmax"]
+DEFAULT_METHOD = "lttb"
+
+
+# Jumlah titik maksimum per trace untuk chart selebar width_px. LTTB cukup
+# satu titik per piksel; min-max butuh dua (min & max per kolom piksel).
+def points_for_width(width_px, method=DEFAULT_METHOD):
+    return int(width_px) * (2 if method == "minmax" else 1)
+
+
+# Largest-Triangle-Three-Buckets: titik pertama & terakhir tetap, sisanya satu
+# titik per bucket yang membentuk segitiga terbesar dengan titik terpilih
+# sebelumnya dan rata-rata bucket berikutnya. x harus naik, tanpa NaN.
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 1)], dtype=np.int64)
+    edges = np.append(np.floor(np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1, n)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+# Min-max: x dibagi (n_out - 2) / 2 bucket, tiap bucket menyimpan titik min
+# dan max-nya (urutan asli), jadi puncak & lembah tidak hilang; titik pertama
+# & terakhir selalu ikut. Hasil paling banyak n_out titik.
+def minmax_indices(x, y, n_out):
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 4:
+        return np.array([0, n - 1][:max(n_out, 1)], dtype=np.int64)
+    buckets = (n_out - 2) // 2
+    bucket = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket))
+    first = np.r_[True, bucket[order][1:] != bucket[order][:-1]]
+    last = np.r_[bucket[order][1:] != bucket[order][:-1], True]
+    keep = np.union1d(order[first], order[last])
+    return np.union1d(keep, [0, n - 1])
+
+
+_INDEXERS = {"lttb": lttb_indices, "minmax": minmax_indices}
+
+
+# Posisi titik yang dipertahankan, paling banyak max_points. NaN (celah
+# data) tidak ikut di-downsample: semua titik valid didownsample sekaligus,
+# lalu satu NaN disisipkan di tiap celah di antara titik yang tersisa supaya
+# garis tetap putus. Celah yang jatuh di antara dua titik terpilih yang sama
+# digabung jadi satu NaN.
+def downsample_indices(x, y, max_points, method=DEFAULT_METHOD):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    indexer = _INDEXERS[method]
+    valid = ~np.isnan(y)
+    if valid.all():
+        return indexer(x, y, max_points)
+
+    valid_pos = np.flatnonzero(valid)
+    gap_starts = np.flatnonzero(~valid & np.r_[True, valid[:-1]])
+    # Jatah titik valid + jumlah NaN penanda <= max_points: penanda paling
+    # banyak satu per celah dan satu per selang antar titik terpilih.
+    budget = max_points - len(gap_starts) if 2 * len(gap_starts) <= max_points else max_points // 2 - 1
+    kept = valid_pos[indexer(x[valid_pos], y[valid_pos], max(budget, 1))] if len(valid_pos) else valid_pos
+    slots = np.searchsorted(kept, gap_starts)
+    _, first = np.unique(slots, return_index=True)
+    return np.sort(np.concatenate([kept, gap_starts[first]]))
+
+
+def downsample(x, y, max_points, method=DEFAULT_METHOD):
+    x, y = np.asarray(x), np.asarray(y)
+    idx = downsample_indices(x, y, max_points, method)
+    return x[idx], y[idx]
+
+
+# Versi frame untuk chart multi-seri (px.line dengan color=by): tiap grup
+# didownsample sendiri, urutan baris dipertahankan.
+def downsample_frame(frame, x, y, by, max_points, method=DEFAULT_METHOD):
+    groups = frame.groupby(by, observed=True, sort=False).indices
+    if not groups or max(len(pos) for pos in groups.values()) <= max_points:
+        return frame
+    xs, ys = frame[x].to_numpy(), frame[y].to_numpy()
+    keep = []
+    for pos in groups.values():
+        pos = pos[np.argsort(xs[pos], kind="stable")]
+        keep.append(pos[downsample_indices(xs[pos], ys[pos], max_points, method)])
+    return frame.iloc[np.sort(np.concatenate(keep))]
@@ -0,0 +1,178 @@
+import argparse
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from aggregates import group_names, rollup
+from data_store import ID_COLUMNS, indicator_columns, load_data
+from figures import overview_figures
+from filters import filter_frame
+from lazy_imports import lazy_import
+from smoothing import SMOOTHING_OPTIONS
+
+plotly = lazy_import("plotly")
+pio = lazy_import("plotly.io")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+CHUNK_ROWS = 50_000
+DATA_FORMATS = ["csv", "parquet"]
+IMAGE_FORMATS = ["png", "svg", "pdf", "jpeg", "webp"]
+IMAGE_SIZE = (1200, 600)
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+class ExportError(RuntimeError):
+    pass
+
+
+# Pilihan pengguna (negara, rentang tahun, indikator) -> slice dari frame
+# bersama lewat filter_frame, jadi export memakai memo yang sama dengan halaman.
+# Grup (Worldwide/region/pendapatan) ditambahkan dari rollup-nya.
+def export_frame(countries, year_range, indicators=None):
+    if indicators is not None:
+        known = indicator_columns(load_data())
+        unknown = [col for col in indicators if col not in known]
+        if unknown:
+            raise ExportError(f"Unknown indicators {unknown}; expected any of {known}")
+    df = load_data(indicators)
+    groups = set(group_names())
+    frame = filter_frame(df, [c for c in countries if c not in groups], year_range, indicators)
+    selected = [c for c in countries if c in groups]
+    if not selected:
+        return frame
+    columns = [col for col in frame.columns if col not in ID_COLUMNS]
+    rollups = [
+        rollup(group, year_range[0], year_range[1])[columns].reset_index().assign(country_name=group)
+        for group in selected
+    ]
+    return pd.concat(rollups + [frame.astype({"country_name": str, "country_id": str})], ignore_index=True)[frame.columns]
+
+
+def iter_chunks(frame, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+# CSV ditulis per chunk (header hanya di chunk pertama) supaya tidak ada
+# string CSV utuh di memori untuk pilihan yang besar.
+def write_csv(frame, target, chunk_rows=CHUNK_ROWS):
+    header = True
+    for chunk in iter_chunks(frame, chunk_rows):
+        chunk.to_csv(target, header=header, index=False)
+        header = False
+    if header:
+        frame.iloc[:0].to_csv(target, index=False)
+
+
+# Parquet: satu row group per chunk lewat ParquetWriter.
+def write_parquet(frame, target, chunk_rows=CHUNK_ROWS):
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    with pq.ParquetWriter(target, schema) as writer:
+        for chunk in iter_chunks(frame, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def write_frame(frame, target, data_format="csv", chunk_rows=CHUNK_ROWS):
+    if data_format not in WRITERS:
+        raise ExportError(f"Unknown data format {data_format!r}; expected one of {DATA_FORMATS}")
+    WRITERS[data_format](frame, target, chunk_rows)
+
+
+# Bytes siap pakai untuk st.download_button.
+def frame_bytes(frame, data_format="csv"):
+    if data_format == "csv":
+        buffer = io.StringIO()
+        write_csv(frame, buffer)
+        return buffer.getvalue().encode("utf-8")
+    buffer = io.BytesIO()
+    write_parquet(frame, buffer)
+    return buffer.getvalue()
+
+
+# Render offline: plotly.js dari paket plotly sendiri, tanpa MathJax (CDN).
+# Chart dashboard tidak memakai peta, jadi topojson tidak dibutuhkan.
+def _use_offline_renderer():
+    pio.defaults.plotlyjs = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+    pio.defaults.mathjax = None
+
+
+# Figure grid Overview untuk banyak negara/grup dibangun paralel di thread pool,
+# lalu semuanya dirender dalam satu panggilan kaleido (satu proses Chrome).
+def render_overview_images(countries, year_range, out_dir, image_format="png",
+                           smoothing="raw", size=IMAGE_SIZE, max_workers=MAX_WORKERS):
+    if image_format not in IMAGE_FORMATS:
+        raise ExportError(f"Unknown image format {image_format!r}; expected one of {IMAGE_FORMATS}")
+    df = load_data()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        grids = list(pool.map(lambda country: overview_figures(df, country, year_range, smoothing), countries))
+
+    figs, files = [], []
+    for country, grid in zip(countries, grids):
+        for name, fig in grid.items():
+            figs.append(fig)
+            files.append(os.path.join(out_dir, f"{_slug(country)}_{name}.{image_format}"))
+    if not figs:
+        return []
+
+    os.makedirs(out_dir, exist_ok=True)
+    _use_offline_renderer()
+    try:
+        pio.write_images(figs, files, format=image_format, width=size[0], height=size[1])
+    except (ValueError, RuntimeError) as exc:
+        raise ExportError(f"Image export needs kaleido>=1.0 and a local Chrome (install one with `plotly_get_chrome`): {exc}") from exc
+    return files
+
+
+def _slug(name):
+    return "".join(ch if ch.isalnum() else "_" for ch in name).strip("_").lower()
+
+
+# Satu job: data terfilter ke out_dir/data.<format> dan (opsional) semua
+# chart Overview per negara ke out_dir/images/.
+def run_export(countries, year_range, out_dir, indicators=None, data_format="csv",
+               image_format=None, smoothing="raw"):
+    os.makedirs(out_dir, exist_ok=True)
+    frame = export_frame(countries, year_range, indicators)
+    data_path = os.path.join(out_dir, f"data.{data_format}")
+    if data_format == "csv":
+        with open(data_path, "w", newline="", encoding="utf-8") as f:
+            write_frame(frame, f, data_format)
+    else:
+        write_frame(frame, data_path, data_format)
+
+    images = []
+    if image_format:
+        images = render_overview_images(countries, year_range, os.path.join(out_dir, "images"),
+                                        image_format, smoothing)
+    return {"data": data_path, "rows": len(frame), "images": images}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export filtered data and Overview charts.")
+    parser.add_argument("--countries", nargs="+", required=True)
+    parser.add_argument("--years", nargs=2, type=int, metavar=("START", "END"), required=True)
+    parser.add_argument("--indicators", nargs="+", default=None)
+    parser.add_argument("--out", default="export")
+    parser.add_argument("--format", choices=DATA_FORMATS, default="csv")
+    parser.add_argument("--images", choices=IMAGE_FORMATS, default=None)
+    parser.add_argument("--smoothing", choices=sorted(set(SMOOTHING_OPTIONS.values())), default="raw")
+    args = parser.parse_args(argv)
+
+    try:
+        result = run_export(args.countries, tuple(args.years), args.out, args.indicators,
+                            args.format, args.images, args.smoothing)
+    except ExportError as exc:
+        parser.exit(1, f"export failed: {exc}\n")
+    print(f"{result['rows']} rows -> {result['data']}")
+    for path in result["images"]:
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
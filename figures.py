@@ -0,0 +1,268 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import streamlit as st
+
+from aggregates import group_names, rollup
+from data_store import ID_COLUMNS, load_index
+from downsample import downsample, points_for_width
+from filters import filter_frame
+from instrumentation import bind_run, instrumented, span
+from lazy_imports import lazy_import
+from smoothing import load_smoothing
+
+go = lazy_import("plotly.graph_objects")
+pio = lazy_import("plotly.io")
+
+BACKGROUND_COLOR = "#2a4664"
+GRID_COLOR = "#314c6b"
+TEMPLATE_NAME = "dashboard"
+
+# Template ringan (tanpa basis template "plotly" yang ~7 KB JSON) yang berisi
+# styling bersama semua chart. Didaftarkan sekali, saat chart pertama dibuat
+# (plotly baru di-import di situ).
+@lru_cache(maxsize=None)
+def register_template():
+    pio.templates[TEMPLATE_NAME] = go.layout.Template(layout=dict(
+        colorway=pio.templates["plotly"].layout.colorway,
+        font=dict(color="white", family="Arial"),
+        title=dict(font=dict(size=28, color="white", family="Arial")),
+        paper_bgcolor=BACKGROUND_COLOR,
+        plot_bgcolor=BACKGROUND_COLOR,
+        xaxis=dict(gridcolor=GRID_COLOR, zerolinecolor=GRID_COLOR, tickfont=dict(size=15)),
+        yaxis=dict(gridcolor=GRID_COLOR, zerolinecolor=GRID_COLOR, tickfont=dict(size=15)),
+        legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(size=14, color="white")),
+        hoverlabel=dict(font=dict(color="white")),
+    ))
+    return TEMPLATE_NAME
+
+# Layout khusus per jenis chart (di atas template).
+#   "trend"      -> chart satu seri di grid Overview
+#   "comparison" -> chart multi-negara di charts/ (interest rate, current account)
+#   "panel"      -> chart tren multi-negara di charts/unemployment_rate.py
+#   "heatmap"    -> matriks korelasi di halaman Correlation
+CHART_LAYOUTS = {
+    "trend": dict(
+        xaxis=dict(title=dict(text="Year")),
+    ),
+    "comparison": dict(
+        title=dict(x=0.05, y=0.90),
+        legend=dict(orientation="v", x=0.8, y=1),
+        font=dict(size=50),
+        margin=dict(l=40, r=40, t=100, b=80),
+    ),
+    "panel": dict(
+        hovermode="x unified",
+        paper_bgcolor="#0E1117",
+        plot_bgcolor="#0E1117",
+        title=dict(font=dict(size=18)),
+        xaxis=dict(title=dict(text="Year"), color="white", showgrid=True, gridcolor="rgba(255,255,255,0.1)"),
+        yaxis=dict(color="white", showgrid=True, gridcolor="rgba(255,255,255,0.1)"),
+        legend=dict(title=dict(text="Country"), orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    ),
+    "heatmap": dict(
+        title=dict(font=dict(size=22)),
+        xaxis=dict(showgrid=False, tickfont=dict(size=12)),
+        yaxis=dict(showgrid=False, tickfont=dict(size=12), autorange="reversed"),
+        margin=dict(l=40, r=40, t=80, b=40),
+    ),
+}
+
+
+# Perkiraan lebar render (px) tiap jenis chart di layout wide; dipakai untuk
+# membatasi jumlah titik per trace (lihat downsample.py).
+CHART_WIDTH_PX = {"trend": 800, "comparison": 1600, "panel": 1600}
+
+
+def max_points(kind):
+    return points_for_width(CHART_WIDTH_PX[kind])
+
+
+# go.Layout yang sudah divalidasi, satu per jenis chart per proses.
+@lru_cache(maxsize=None)
+def base_layout(kind):
+    return go.Layout(template=register_template(), **CHART_LAYOUTS[kind])
+
+
+# Bangun figure dari skeleton yang di-cache; per panggilan hanya trace dan
+# bagian layout yang berubah (judul, range, dll.) yang diisi.
+@instrumented("figure.build")
+def make_figure(kind, title=None, traces=(), **layout):
+    fig = go.Figure(data=list(traces), layout=base_layout(kind))
+    if title is not None:
+        layout["title_text"] = title
+    if layout:
+        fig.update_layout(**layout)
+    return fig
+
+
+def _line_trace(name, x, y, hover_label, width, marker_size):
+    return go.Scatter(
+        x=x,
+        y=y,
+        mode="lines+markers",
+        name=name,
+        line=dict(width=width),
+        marker=dict(size=marker_size),
+        hovertemplate=f"{name}" + "<br>Year: %{x}<br>" + hover_label + ": %{y:.2f}%",
+    )
+
+
+# Trace untuk banyak negara/grup sekaligus. Baris negara diambil lewat
+# CountryYearIndex (tanpa boolean mask per negara), grup dari rollup yang
+# sudah dihitung; grup ditaruh lebih dulu seperti sebelumnya. Dengan
+# smoothing != "raw" semua seri dibaca dari tabel smoothing yang sudah jadi.
+# Seri yang lebih panjang dari lebar chart didownsample (LTTB) dulu.
+@instrumented("series.comparison")
+def comparison_traces(df, column, names, year_range, hover_label, smoothing="raw", index=None):
+    index = index if index is not None else load_index()
+    groups = set(group_names())
+    years = df["year"].to_numpy()
+    values = df[column].to_numpy()
+    start, end = year_range
+    smoothed = load_smoothing() if smoothing != "raw" else None
+
+    group_traces, country_traces = [], []
+    for name in names:
+        width, marker_size, traces = (4, 6, group_traces) if name in groups else (3, 5, country_traces)
+        if smoothed is not None:
+            x, y = smoothed.series(name, column, start, end, smoothing)
+        elif name in groups:
+            series = rollup(name, start, end)[column]
+            x, y = series.index, series.to_numpy()
+        else:
+            pos = index.rows(name, start, end)
+            x, y = years[pos], values[pos]
+        if len(x):
+            x, y = downsample(x, y, max_points('comparison'))
+            traces.append(_line_trace(name, x, y, hover_label, width, marker_size))
+    return group_traces + country_traces
+
+
+# theme=None supaya template dashboard tidak ditimpa tema bawaan Streamlit.
+def show_figure(fig, target=st, **kwargs):
+    with span("render.plotly_chart"):
+        return target.plotly_chart(fig, use_container_width=True, theme=None, **kwargs)
+
+
+# Seri untuk grid Overview satu negara/grup: (bar_range, line_range). Bar
+# selalu data asli; line ikut pilihan smoothing.
+@instrumented("series.overview")
+def overview_series(df, country, year_range, smoothing="raw", columns=None):
+    if country in group_names():
+        bar_range = rollup(country, year_range[0], year_range[1]).reset_index()
+    else:
+        bar_range = filter_frame(df, [country], year_range)
+    if smoothing == "raw":
+        return bar_range, bar_range
+    columns = columns or [col for col in df.columns if col not in ID_COLUMNS]
+    return bar_range, load_smoothing().frame(country, columns, year_range[0], year_range[1], smoothing)
+
+
+def _trend_line(frame, column, hovertemplate):
+    x, y = downsample(frame['year'], frame[column], max_points('trend'))
+    return go.Scatter(x=x, y=y, mode='lines', line=dict(width=4), hovertemplate=hovertemplate)
+
+
+# Enam chart grid Overview, urut sesuai posisi di grid (kiri-kanan, atas-bawah).
+# Dipakai halaman Overview dan export gambar, jadi keduanya selalu sama.
+def _gdp_per_capita(bar_range, line_range):
+    return make_figure('trend', 'GDP Per Capita Trend', [_trend_line(
+        line_range, 'GDP per Capita (Current USD)',
+        '<b>Year:</b> %{x}<br><b>GDP Per Capita:</b> %{y}<extra></extra>',
+    )], yaxis_title='GDP per Capita (Current USD)')
+
+
+def _inflation(bar_range, line_range):
+    return make_figure('trend', 'Inflation Rate', [_trend_line(
+        line_range, 'Inflation (CPI %)',
+        '<b>Year:</b> %{x}<br><b>Inflation:</b> %{y:.2f}%<extra></extra>',
+    )], yaxis_title='Inflation')
+
+
+def _revenue_expense(bar_range, line_range):
+    return make_figure('trend', 'Government Revenue vs Expense', [
+        go.Bar(
+            x=bar_range['year'],
+            y=bar_range['Government Revenue (% of GDP)'],
+            name='Revenue',
+            hovertemplate='<b>Year:</b> %{x}<br><b>Revenue:</b> %{y:.2f}% of GDP<extra></extra>'
+        ),
+        go.Bar(
+            x=bar_range['year'],
+            y=bar_range['Government Expense (% of GDP)'],
+            name='Expense',
+            hovertemplate='<b>Year:</b> %{x}<br><b>Expense:</b> %{y:.2f}% of GDP<extra></extra>'
+        ),
+    ], barmode='group', yaxis_title='% of GDP')
+
+
+def _unemployment(bar_range, line_range):
+    return make_figure('trend', 'Unemployment Rate', [go.Bar(
+        x=bar_range['year'],
+        y=bar_range['Unemployment Rate (%)'],
+        hovertemplate='<b>Year:</b> %{x}<br><b>Unemployment:</b> %{y:.2f}%<extra></extra>'
+    )], yaxis_title='Unemployment (%)')
+
+
+def _interest_rate(bar_range, line_range):
+    return make_figure('trend', 'Interest Rate', [_trend_line(
+        line_range, 'Interest Rate (Real, %)',
+        '<b>Year:</b> %{x}<br><b>Interest Rate:</b> %{y:.2f}%<extra></extra>',
+    )], yaxis_title='Interest Rate (%)')
+
+
+def _current_account(bar_range, line_range):
+    return make_figure('trend', 'Current Account Balance', [_trend_line(
+        line_range, 'Current Account Balance (% GDP)',
+        '<b>Year:</b> %{x}<br><b>Current Account Balance:</b> %{y:.2f}% of GDP<extra></extra>',
+    )], yaxis_title='Current Account Balance (% of GDP)')
+
+
+OVERVIEW_CHARTS = {
+    "gdp_per_capita": _gdp_per_capita,
+    "inflation": _inflation,
+    "revenue_expense": _revenue_expense,
+    "unemployment": _unemployment,
+    "interest_rate": _interest_rate,
+    "current_account": _current_account,
+}
+
+# Input yang menentukan isi tiap chart (untuk rerun_graph): chart bar selalu
+# data asli, jadi tidak ikut berubah saat pilihan smoothing diganti.
+_BAR_INPUTS = ("country", "year_start", "year_end")
+_LINE_INPUTS = _BAR_INPUTS + ("smoothing",)
+OVERVIEW_CHART_INPUTS = {
+    "gdp_per_capita": _LINE_INPUTS,
+    "inflation": _LINE_INPUTS,
+    "revenue_expense": _BAR_INPUTS,
+    "unemployment": _BAR_INPUTS,
+    "interest_rate": _LINE_INPUTS,
+    "current_account": _LINE_INPUTS,
+}
+
+# Pool bersama (per proses) untuk membangun figure Overview. Worker hanya
+# menyentuh plotly dan frame yang sudah jadi: semua pemanggilan Streamlit
+# (loader ber-cache, plotly_chart) tetap di thread script yang punya
+# ScriptRunContext. DASHBOARD_FIGURE_WORKERS=1 -> berurutan.
+FIGURE_WORKERS = int(os.environ.get("DASHBOARD_FIGURE_WORKERS", len(OVERVIEW_CHARTS)))
+_figure_pool = ThreadPoolExecutor(max_workers=FIGURE_WORKERS, thread_name_prefix="figures") if FIGURE_WORKERS > 1 else None
+
+
+# Data diambil di thread pemanggil, lalu tiap figure dibangun di pool. Hasil
+# dikumpulkan menurut urutan OVERVIEW_CHARTS (bukan urutan selesai), jadi
+# susunan grid deterministik. names membatasi chart yang dibangun (rerun
+# inkremental hanya membangun ulang chart yang input-nya berubah).
+@instrumented("figure.overview")
+def overview_figures(df, country, year_range, smoothing="raw", names=None):
+    charts = {name: OVERVIEW_CHARTS[name] for name in (names or OVERVIEW_CHARTS)}
+    if not any("smoothing" in OVERVIEW_CHART_INPUTS[name] for name in charts):
+        smoothing = "raw"
+    bar_range, line_range = overview_series(df, country, year_range, smoothing)
+    # Template & layout didaftarkan sekali di sini, bukan berebut di worker.
+    base_layout('trend')
+    if _figure_pool is None or len(charts) == 1:
+        return {name: build(bar_range, line_range) for name, build in charts.items()}
+    futures = {name: _figure_pool.submit(bind_run(build), bar_range, line_range) for name, build in charts.items()}
+    return {name: future.result() for name, future in futures.items()}
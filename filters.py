@@ -0,0 +1,124 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from data_store import ID_COLUMNS, load_index
+from instrumentation import instrumented
+
+MAX_ENTRIES = 512
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def _nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, np.ndarray) or hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+# LRU yang dibatasi jumlah entri dan total ukuran (byte). Dipakai bersama oleh
+# semua session (thread Streamlit), jadi semua akses lewat lock.
+class FilterCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Hitung di luar lock; kalau dua session balapan, hasilnya sama saja.
+        value = compute()
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+_cache = FilterCache()
+
+
+# Key ternormalisasi: urutan pilihan negara / indikator tidak berpengaruh.
+def filter_key(countries, year_range, indicators=None):
+    return (
+        tuple(sorted(set(countries))),
+        (int(year_range[0]), int(year_range[1])),
+        None if indicators is None else tuple(sorted(set(indicators))),
+    )
+
+
+# Slice lewat CountryYearIndex tanpa memo (juga dipakai benchmark.py).
+def slice_frame(df, index, countries, year_range, indicators=None):
+    start, end = year_range
+    pos = [index.rows(country, start, end) for country in countries]
+    pos = np.sort(np.concatenate(pos)) if pos else np.empty(0, dtype=np.int64)
+    frame = df.iloc[pos]
+    if indicators is not None:
+        frame = frame[ID_COLUMNS + [col for col in indicators if col not in ID_COLUMNS]]
+    return frame
+
+
+# Slice (negara, rentang tahun, indikator) dari frame bersama data_store, lewat
+# CountryYearIndex dan di-memo. id(df) aman dipakai sebagai bagian key karena
+# frame dari load_data() hidup selama proses.
+@instrumented("filter")
+def filter_frame(df, countries, year_range, indicators=None):
+    key = ("filter", id(df)) + filter_key(countries, year_range, indicators)
+    return _cache.get_or_compute(key, lambda: slice_frame(df, load_index(), *key[2:]))
+
+
+# Memo untuk turunan lain (statistik, seri, dict skala, ...) dengan key yang
+# sudah dinormalisasi oleh pemanggil.
+def memoize(name, key, compute):
+    return _cache.get_or_compute((name,) + tuple(key), compute)
+
+
+def cache_stats():
+    return _cache.stats()
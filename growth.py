@@ -0,0 +1,117 @@
+import numpy as np
+import streamlit as st
+
+from aggregates import load_group_rollups
+from data_store import CountryYearIndex, indicator_columns, load_artifacts, read_dataset
+
+
+# YoY %, delta absolut dan CAGR untuk setiap (entitas, tahun, indikator).
+# Entitas = negara dan grup (Worldwide/region/pendapatan). Semua disimpan
+# sebagai array padat entitas x tahun x indikator dan dihitung sekali dengan
+# satu operasi shift/diff; lookup per metrik jadi indexing biasa.
+# delta/yoy boleh diberikan langsung (artifact precompute).
+class GrowthTable:
+    def __init__(self, names, first_year, columns, values, delta=None, yoy=None):
+        self.names = list(names)
+        self.first_year = first_year
+        self.last_year = first_year + values.shape[1] - 1
+        self.columns = list(columns)
+        self.values = values
+        self._name_pos = {name: i for i, name in enumerate(self.names)}
+        self._col_pos = {col: k for k, col in enumerate(self.columns)}
+        if delta is not None and yoy is not None:
+            self.delta, self.yoy = delta, yoy
+            return
+
+        prev, cur = values[:, :-1], values[:, 1:]
+        self.delta = np.full_like(values, np.nan)
+        self.delta[:, 1:] = cur - prev
+        self.yoy = np.full_like(values, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.yoy[:, 1:] = np.where(prev != 0, (cur - prev) / prev * 100, np.nan)
+
+    def _cell(self, arr, name, column, year):
+        i = self._name_pos.get(name)
+        if i is None or column not in self._col_pos or not self.first_year <= year <= self.last_year:
+            return np.nan
+        return float(arr[i, int(year) - self.first_year, self._col_pos[column]])
+
+    def value(self, name, column, year):
+        return self._cell(self.values, name, column, year)
+
+    def yoy_of(self, name, column, year):
+        return self._cell(self.yoy, name, column, year)
+
+    def delta_of(self, name, column, year):
+        return self._cell(self.delta, name, column, year)
+
+    def _window(self, start, end):
+        start = max(int(start), self.first_year)
+        end = min(int(end), self.last_year)
+        return start, end
+
+    # Perubahan total (%) dan CAGR (%/tahun) untuk semua entitas x indikator
+    # pada satu jendela sekaligus; NaN kalau nilai awal <= 0 atau tidak ada.
+    def period_change(self, start, end):
+        start, end = self._window(start, end)
+        if end <= start:
+            return np.full((len(self.names), len(self.columns)), np.nan)
+        first = self.values[:, start - self.first_year]
+        last = self.values[:, end - self.first_year]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(first > 0, (last - first) / first * 100, np.nan)
+
+    def cagr(self, start, end):
+        start, end = self._window(start, end)
+        if end <= start:
+            return np.full((len(self.names), len(self.columns)), np.nan)
+        first = self.values[:, start - self.first_year]
+        last = self.values[:, end - self.first_year]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = np.where((first > 0) & (last >= 0), last / first, np.nan)
+            return (ratio ** (1 / (end - start)) - 1) * 100
+
+    def period_change_of(self, name, column, start, end):
+        i = self._name_pos.get(name)
+        if i is None or column not in self._col_pos:
+            return np.nan
+        return float(self.period_change(start, end)[i, self._col_pos[column]])
+
+    def cagr_of(self, name, column, start, end):
+        i = self._name_pos.get(name)
+        if i is None or column not in self._col_pos:
+            return np.nan
+        return float(self.cagr(start, end)[i, self._col_pos[column]])
+
+
+# Negara + grup rollup disusun jadi satu array entitas x tahun x indikator.
+def stack_series(df, rollups=None):
+    index = CountryYearIndex(df)
+    columns = indicator_columns(df)
+    values = index.dense(df[columns].to_numpy(dtype=np.float64))
+    names = list(index.countries)
+
+    if rollups:
+        years = np.arange(index.first_year, index.last_year + 1)
+        group_values = np.stack([
+            frame.reindex(index=years, columns=columns).to_numpy(dtype=np.float64)
+            for frame in rollups.values()
+        ])
+        values = np.concatenate([values, group_values])
+        names += list(rollups)
+    return names, index.first_year, columns, values
+
+
+def build_growth_table(df, rollups=None):
+    return GrowthTable(*stack_series(df, rollups))
+
+
+@st.cache_resource(show_spinner=False)
+def load_growth():
+    artifacts = load_artifacts()
+    if artifacts is not None:
+        return GrowthTable(
+            artifacts["names"], artifacts["first_year"], artifacts["columns"],
+            *(artifacts.array(f"growth_{name}") for name in ("values", "delta", "yoy")),
+        )
+    return build_growth_table(read_dataset(), load_group_rollups())
@@ -0,0 +1,84 @@
+import warnings
+
+import numpy as np
+import streamlit as st
+
+from data_store import CountryYearIndex, indicator_columns, load_artifacts, read_dataset
+
+# Statistik per indikator, dihitung sekali saat load (atau saat precompute):
+# min, max, persentil p1/p99, dan rentang tampilan robust (lo, hi). Tersedia
+# untuk seluruh data dan per tahun. Rentang tampilan memakai p1/p99, jadi satu
+# outlier (mis. tahun hiperinflasi) tidak membuat bar lain jadi rata.
+STATS = ["min", "max", "p1", "p99", "lo", "hi"]
+HEADROOM = 0.1
+
+
+# Bulatkan ke atas ke 1/2/2.5/5 x 10^k supaya label "Max: ..." mudah dibaca.
+def nice_ceil(values):
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full_like(values, np.nan)
+    positive = values > 0
+    magnitude = 10.0 ** np.floor(np.log10(values[positive]))
+    scaled = values[positive] / magnitude
+    steps = np.array([1.0, 2.0, 2.5, 5.0, 10.0])
+    out[positive] = steps[np.searchsorted(steps, scaled - 1e-9)] * magnitude
+    return out
+
+
+# values: (..., indikator) dengan sumbu pertama = sampel. Hasil (STATS, ...).
+def _summary(values):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+        p1, p99 = np.nanpercentile(values, [1, 99], axis=0)
+    lo = np.where(p1 < 0, -nice_ceil(-p1 * (1 + HEADROOM)), 0.0)
+    hi = nice_ceil(p99 * (1 + HEADROOM))
+    # Indikator tanpa nilai positif: pakai rentang default 0-100.
+    hi = np.where(np.isnan(hi), np.where(np.isnan(high), 100.0, np.maximum(high, 1.0)), hi)
+    return np.stack([low, high, p1, p99, lo, hi])
+
+
+class IndicatorStats:
+    def __init__(self, columns, first_year, overall, by_year):
+        self.columns = list(columns)
+        self.first_year = first_year
+        self.overall = overall        # STATS x indikator
+        self.by_year = by_year        # tahun x STATS x indikator
+        self._col_pos = {col: k for k, col in enumerate(self.columns)}
+        self._stat_pos = {stat: s for s, stat in enumerate(STATS)}
+
+    def get(self, column, stat, year=None):
+        k, s = self._col_pos.get(column), self._stat_pos[stat]
+        if k is None:
+            return np.nan
+        if year is None:
+            return float(self.overall[s, k])
+        t = int(year) - self.first_year
+        if not 0 <= t < len(self.by_year):
+            return np.nan
+        return float(self.by_year[t, s, k])
+
+    def display_range(self, column, year=None):
+        return self.get(column, "lo", year), self.get(column, "hi", year)
+
+    # Skala bar (nilai maksimum) per kolom; year=None -> seluruh data.
+    def scales(self, columns, year=None):
+        return {col: self.get(col, "hi", year) for col in columns if col in self._col_pos}
+
+
+def build_indicator_stats(df):
+    index = CountryYearIndex(df)
+    columns = indicator_columns(df)
+    values = index.dense(df[columns].to_numpy(dtype=np.float64))
+    overall = _summary(values.reshape(-1, len(columns)))
+    by_year = np.moveaxis(_summary(values), 0, 1)
+    return IndicatorStats(columns, index.first_year, overall, by_year)
+
+
+@st.cache_resource(show_spinner=False)
+def load_indicator_stats():
+    artifacts = load_artifacts()
+    if artifacts is not None:
+        return IndicatorStats(artifacts["columns"], artifacts["first_year"],
+                              artifacts.array("stats_overall"), artifacts.array("stats_by_year"))
+    return build_indicator_stats(read_dataset())
@@ -0,0 +1,182 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Span bernama untuk jalur panas tiap rerun (load, filter, aggregate, figure,
+# render). Aktif kalau DASHBOARD_INSTRUMENT=1; kalau tidak, span() cuma
+# mengembalikan nullcontext bersama, jadi biayanya satu cek flag.
+ENABLED = os.environ.get("DASHBOARD_INSTRUMENT", "") not in ("", "0")
+METRICS_PATH = os.environ.get("DASHBOARD_METRICS_PATH")
+SPAN_LOG_PATH = os.environ.get("DASHBOARD_SPAN_LOG")
+
+_NOOP = nullcontext()
+# Batas span per rerun (script tanpa begin_run tidak menumpuk tanpa batas).
+MAX_SPANS = 5000
+_local = threading.local()
+_totals = {}
+_totals_lock = threading.Lock()
+
+
+def enable(flag=True):
+    global ENABLED
+    ENABLED = flag
+
+
+# Span per rerun disimpan per thread: tiap session Streamlit menjalankan
+# script-nya di thread sendiri.
+def _run():
+    run = getattr(_local, "run", None)
+    if run is None:
+        run = _local.run = {"page": None, "start": time.perf_counter(), "spans": [], "depth": 0}
+    return run
+
+
+def begin_run(page):
+    if ENABLED:
+        _local.run = {"page": page, "start": time.perf_counter(), "spans": [], "depth": 0}
+
+
+@contextmanager
+def _span(name):
+    run = _run()
+    depth = run["depth"]
+    run["depth"] = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        run["depth"] = depth
+        if len(run["spans"]) < MAX_SPANS:
+            run["spans"].append({"name": name, "depth": depth, "start": start - run["start"], "seconds": duration})
+        with _totals_lock:
+            count, total, worst = _totals.get(name, (0, 0.0, 0.0))
+            _totals[name] = (count + 1, total + duration, max(worst, duration))
+
+
+def span(name):
+    return _span(name) if ENABLED else _NOOP
+
+
+def instrumented(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Bungkus fn yang akan dijalankan di thread worker (pool): span-nya dicatat
+# di rerun thread pemanggil (offset waktu & kedalaman ikut pemanggil), bukan
+# di run thread-local worker yang tidak pernah di-reset.
+def bind_run(fn):
+    if not ENABLED:
+        return fn
+    parent = _run()
+    depth = parent["depth"]
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        run = _local.run = {"page": parent["page"], "start": parent["start"], "spans": [], "depth": depth}
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            del _local.run
+            room = MAX_SPANS - len(parent["spans"])
+            if room > 0:
+                parent["spans"].extend(run["spans"][:room])
+    return wrapper
+
+
+# Span rerun ini, urut waktu mulai (span luar sebelum span dalamnya).
+def run_spans():
+    return sorted(_run()["spans"], key=lambda s: (s["start"], s["depth"]))
+
+
+def totals():
+    with _totals_lock:
+        return {name: {"count": c, "seconds": t, "max": m} for name, (c, t, m) in _totals.items()}
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Format teks Prometheus (mis. untuk textfile collector node_exporter).
+def prometheus_text(extra=None):
+    lines = [
+        "# HELP dashboard_span_seconds Time spent in instrumented spans.",
+        "# TYPE dashboard_span_seconds summary",
+    ]
+    for name, t in sorted(totals().items()):
+        lines.append(f'dashboard_span_seconds_sum{{span="{_label(name)}"}} {t["seconds"]:.6f}')
+        lines.append(f'dashboard_span_seconds_count{{span="{_label(name)}"}} {t["count"]}')
+    lines += ["# HELP dashboard_span_max_seconds Slowest single span.", "# TYPE dashboard_span_max_seconds gauge"]
+    for name, t in sorted(totals().items()):
+        lines.append(f'dashboard_span_max_seconds{{span="{_label(name)}"}} {t["max"]:.6f}')
+    for metric, value in (extra or {}).items():
+        lines += [f"# TYPE dashboard_{metric} gauge", f"dashboard_{metric} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def run_record():
+    run = _run()
+    return {"timestamp": time.time(), "page": run["page"], "spans": run_spans()}
+
+
+def write_prometheus(path, extra=None):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        f.write(prometheus_text(extra))
+    os.replace(tmp_path, path)
+
+
+def append_span_log(path):
+    with open(path, "a") as f:
+        f.write(json.dumps(run_record()) + "\n")
+
+
+# Dipanggil di akhir script: tulis metrik/log kalau path-nya diset, lalu
+# tampilkan panel debug di sidebar.
+def end_run():
+    if not ENABLED:
+        return
+    from filters import cache_stats
+
+    cache = {f"filter_cache_{key}": value for key, value in cache_stats().items()}
+    if METRICS_PATH:
+        write_prometheus(METRICS_PATH, cache)
+    if SPAN_LOG_PATH:
+        append_span_log(SPAN_LOG_PATH)
+    debug_panel(cache)
+
+
+def debug_panel(extra=None):
+    import pandas as pd
+    import streamlit as st
+
+    spans = run_spans()
+    with st.sidebar.expander("Timings", expanded=False):
+        if not spans:
+            st.caption("No spans recorded in this rerun.")
+            return
+        table = pd.DataFrame({
+            "span": ["· " * s["depth"] + s["name"] for s in spans],
+            "ms": [s["seconds"] * 1000 for s in spans],
+            "start ms": [s["start"] * 1000 for s in spans],
+        })
+        top_level = sum(s["seconds"] for s in spans if s["depth"] == 0)
+        st.caption(f"{len(spans)} spans, {top_level * 1000:.1f} ms at top level")
+        st.dataframe(table, hide_index=True, use_container_width=True, column_config={
+            "ms": st.column_config.NumberColumn(format="%.2f"),
+            "start ms": st.column_config.NumberColumn(format="%.1f"),
+        })
+        st.download_button("Prometheus metrics", prometheus_text(extra), file_name="dashboard_metrics.prom")
+        st.download_button("JSON log", json.dumps(run_record(), indent=2), file_name="dashboard_spans.json")
@@ -0,0 +1,53 @@
+import importlib
+import sys
+import threading
+import time
+import types
+
+# Modul berat (plotly, altair, pyarrow.parquet, ...) di-import saat atributnya
+# pertama kali dipakai, bukan saat halaman di-import. Waktu import sebenarnya
+# dicatat di sini supaya startup_profile.py bisa melaporkannya.
+_import_times = {}
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    _import_times.setdefault(self.__name__, time.perf_counter() - start)
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+# Kalau modul sudah ada di sys.modules, langsung kembalikan modul aslinya.
+def lazy_import(name):
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+# {nama modul: detik} untuk modul lazy yang sudah benar-benar di-import.
+def import_times():
+    with _lock:
+        return dict(_import_times)
@@ -1,63 +1,25 @@
+import numpy as np
 import streamlit as st
 import pandas as pd
 
+from aggregates import load_group_members
+from comparative import bar_scales, format_number, is_numeric_only, render_panel_html
+from comparison import MAX_SELECTIONS, comparison_matrix, heat_styles, percentile_matrix, rank_matrix
+from data_store import load_data, load_index, indicator_columns as get_indicator_columns
+from instrumentation import begin_run, end_run, span
+
 st.set_page_config(page_title="Comparative Panel", layout="wide")
 st.title("Comparative Panel")
+begin_run("Comparative")
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/world_bank_data.csv")
-    return df
-
-data = load_data()
-countries = sorted(data["country_name"].unique())
-years = [year for year in sorted(data["year"].unique()) if year <= 2023]
-
-# Fungsi format angka T, B, M
-def format_number(val):
-    if pd.isna(val):
-        return "N/A"
-    elif val >= 1e12:
-        return f"{val / 1e12:.2f} T"
-    elif val >= 1e9:
-        return f"{val / 1e9:.2f} B"
-    elif val >= 1e6:
-        return f"{val / 1e6:.2f} M"
-    else:
-        return f"{val:,.0f}"
-
-# Fungsi buat bar indikator
-def render_bar(value, max_value=100, label=""):
-    if pd.isna(value):
-        value_text = "N/A"
-        bar_width = 0
-        over = False
-    else:
-        value_text = f"{value:.2f}%"
-        over = value > max_value
-        bar_width = min(value / max_value, 1.0) * 100
-
-    bar_color = "#f28e69" if over else "#69b3f2"
-    max_label = f"Max: {max_value:.0f}%" + (" <span title='Exceeds scale'>⚠️</span>" if over else "")
-
-    return f"""
-        <div style="margin-bottom:16px">
-            <div style='display: flex; justify-content: space-between; font-size:0.85rem; margin-bottom:4px;'>
-                <span>{label}</span>
-                <span>{value_text}</span>
-            </div>
-            <div style="background-color:#e0e0e0;width:100%;height:12px;border-radius:4px;overflow:hidden;">
-                <div style="background-color:{bar_color};width:{bar_width}%;height:100%"></div>
-            </div>
-            <div style='display: flex; justify-content: space-between; font-size:0.75rem; color: #888; margin-top:2px'>
-                <span>0%</span>
-                <span>{max_label}</span>
-            </div>
-        </div>
-    """
+with span("load"):
+    data = load_data()
+    index = load_index()
+    countries = list(data["country_name"].cat.categories)
+    years = [year for year in sorted(data["year"].unique()) if year <= 2023]
 
 # Ambil semua indikator numerik (kecuali country & year)
-indicator_columns = [col for col in data.columns if col not in ["country_name", "year"] and pd.api.types.is_numeric_dtype(data[col])]
+indicator_columns = get_indicator_columns(data)
 
 # User pilih indikator yang ingin ditampilkan
 selected_indicators = st.multiselect(
@@ -66,59 +28,107 @@ selected_indicators = st.multiselect(
     default=["GDP (Current USD)", "GDP Growth (% Annual)", "Tax Revenue (% of GDP)", "Public Debt (% of GDP)"]
 )
 
-# Pilih jumlah panel
-num_panels = st.number_input("Jumlah panel perbandingan", min_value=2, max_value=4, value=2, step=1)
-
-# Tentukan mana indikator angka dan mana yang bar (% / rasio)
-def is_numeric_only(col):
-    return "USD" in col or "Income" in col or ("GDP" in col and "%" not in col)
-
-# Siapkan max_value per kolom berdasarkan data
-max_dict = {}
-for col in selected_indicators:
-    max_val = data[col].max()
-    if "growth" in col.lower():
-        max_dict[col] = 15
-    elif "tax" in col.lower():
-        max_dict[col] = 50
-    elif "debt" in col.lower():
-        max_dict[col] = 200
-    elif "%" in col:
-        max_dict[col] = min(100, max_val + 10)
+# Mode panel (2-4 panel berdampingan) atau tabel N-way (banyak negara x tahun
+# sekaligus, mis. satu negara terhadap seluruh peer group-nya)
+PANEL_MODE, TABLE_MODE = "Panels", "Table (N-way)"
+mode = st.radio("Mode", [PANEL_MODE, TABLE_MODE], horizontal=True)
+
+
+def render_panels():
+    # Pilih jumlah panel
+    num_panels = st.number_input("Jumlah panel perbandingan", min_value=2, max_value=4, value=2, step=1)
+
+    # Skala bar per indikator (rentang robust p1/p99 yang dihitung sekali saat load)
+    with span("aggregate.scales"):
+        max_dict = bar_scales(selected_indicators)
+
+    # Pilihan negara & tahun tiap panel
+    def panel_selection(panel, i):
+        with panel:
+            st.markdown(f"### Panel {i}")
+
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                country = st.selectbox(f"Select Country {i}", countries, key=f"country_{i}")
+            with col2:
+                year = st.selectbox(f"Select Year {i}", years, key=f"year_{i}")
+        return index.row(country, year)
+
+    # Buat kolom panel dinamis, lalu ambil baris semua panel dalam satu fetch
+    panels = st.columns(num_panels)
+    positions = np.array([panel_selection(panels[i], i + 1) for i in range(num_panels)])
+    with span("filter.row"):
+        found = positions >= 0
+        values = np.full((num_panels, len(selected_indicators)), np.nan)
+        values[found] = data.iloc[positions[found], data.columns.get_indexer(selected_indicators)].to_numpy(dtype=np.float64)
+
+    # Satu blok HTML (indikator angka dulu, lalu bar) = satu st.markdown per panel
+    for i, panel in enumerate(panels):
+        with span("render.panel"), panel:
+            if not found[i]:
+                st.warning("Data not found for this selection.")
+                continue
+            st.markdown(render_panel_html(values[i], selected_indicators, max_dict), unsafe_allow_html=True)
+
+
+TABLE_VIEWS = ["Value", "Rank", "Percentile"]
+
+
+def render_table():
+    groups = load_group_members()
+    col1, col2, col3, col4 = st.columns([2, 3, 2, 1])
+    with col1:
+        group_options = ["(none)"] + list(groups)
+        default_group = group_options.index("Upper middle income") if "Upper middle income" in groups else 0
+        peer_group = st.selectbox("Peer group", group_options, index=default_group)
+    with col2:
+        picked = st.multiselect("Countries", countries, default=["Indonesia"])
+    with col3:
+        selected_years = st.multiselect("Years", years, default=[years[-1]])
+    with col4:
+        view = st.radio("Show", TABLE_VIEWS)
+
+    selection = list(dict.fromkeys(picked + groups.get(peer_group, [])))
+    if not selection or not selected_years or not selected_indicators:
+        st.info("Pilih minimal satu negara/peer group, satu tahun, dan satu indikator.")
+        return
+    max_countries = max(MAX_SELECTIONS // len(selected_years), 1)
+    if len(selection) > max_countries:
+        st.warning(f"Dibatasi {MAX_SELECTIONS} seleksi: hanya {max_countries} negara pertama yang ditampilkan.")
+        selection = selection[:max_countries]
+
+    # Satu fetch ber-index -> matriks seleksi x indikator; rank & persentil
+    # dihitung sekali untuk seluruh matriks
+    with span("filter.rows"):
+        matrix = comparison_matrix(data, index, selection, sorted(selected_years), selected_indicators)
+    if matrix.empty:
+        st.warning("Data not found for this selection.")
+        return
+    with span("aggregate.ranks"):
+        values = matrix.to_numpy()
+        ranks = rank_matrix(values)
+        pct = percentile_matrix(values, ranks)
+
+    shown = {"Value": values, "Rank": ranks, "Percentile": pct}[view]
+    table = pd.DataFrame(shown, index=matrix.index, columns=matrix.columns).reset_index()
+    if view == "Value":
+        formats = {col: format_number if is_numeric_only(col) else "{:.2f}" for col in selected_indicators}
     else:
-        max_dict[col] = max_val + (0.1 * max_val)
-
-# Fungsi render tiap panel
-def render_panel(panel, i):
-    with panel:
-        st.markdown(f"### Panel {i}")
-
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            country = st.selectbox(f"Select Country {i}", countries, key=f"country_{i}")
-        with col2:
-            year = st.selectbox(f"Select Year {i}", years, key=f"year_{i}")
-
-        row = data[(data["country_name"] == country) & (data["year"] == year)]
-        if row.empty:
-            st.warning("Data not found for this selection.")
-            return
-        row = row.iloc[0]
-
-        # Tampilkan indikator angka dulu
-        for col in selected_indicators:
-            if is_numeric_only(col):
-                val = row[col]
-                st.markdown(f"**{col}:** {format_number(val)}", unsafe_allow_html=True)
-
-        # Lalu tampilkan bar indikator
-        for col in selected_indicators:
-            if not is_numeric_only(col):
-                val = row[col]
-                max_val = max_dict.get(col, 100)
-                st.markdown(render_bar(val, label=col, max_value=max_val), unsafe_allow_html=True)
-
-# Buat kolom panel dinamis & render
-panels = st.columns(num_panels)
-for i in range(num_panels):
-    render_panel(panels[i], i + 1)
+        formats = {col: "{:.0f}" for col in selected_indicators}
+
+    with span("render.table"):
+        st.caption(f"{len(matrix)} seleksi x {len(selected_indicators)} indikator. "
+                   "Warna = persentil dalam seleksi (biru = tertinggi); klik judul kolom untuk mengurutkan.")
+        styler = (table.style
+                  .apply(lambda _: heat_styles(pct), axis=None, subset=selected_indicators)
+                  .format(formats, na_rep="N/A"))
+        st.dataframe(styler, hide_index=True, use_container_width=True,
+                     height=min(38 + 35 * len(table), 700))
+
+
+if mode == TABLE_MODE:
+    render_table()
+else:
+    render_panels()
+
+end_run()
@@ -0,0 +1,65 @@
+import streamlit as st
+
+from correlation import country_pair_table, load_correlation_stats, pooled_correlation
+from data_store import load_index
+from figures import make_figure, show_figure
+from growth import load_growth
+from instrumentation import begin_run, end_run
+from lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
+st.set_page_config(page_title="Indicator Correlation", layout="wide")
+st.title("Indicator Correlation")
+begin_run("Correlation")
+
+growth = load_growth()
+countries = load_index().countries
+years = [year for year in range(growth.first_year, growth.last_year + 1) if year <= 2023]
+
+selected_indicators = st.multiselect(
+    "Pilih indikator",
+    growth.columns,
+    default=["Public Debt (% of GDP)", "Interest Rate (Real, %)", "Inflation (CPI %)"]
+)
+year_range = st.slider("Year Range", min_value=min(years), max_value=max(years), value=(min(years), max(years)))
+
+if len(selected_indicators) < 2:
+    st.warning("Pilih minimal dua indikator.")
+    st.stop()
+
+def correlation_heatmap(matrix, title):
+    return make_figure('heatmap', title, [go.Heatmap(
+        z=matrix.values,
+        x=list(matrix.columns),
+        y=list(matrix.index),
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        text=matrix.round(2).values,
+        texttemplate='%{text}',
+        hovertemplate='%{y}<br>%{x}<br>r = %{z:.2f}<extra></extra>'
+    )])
+
+col1, col2 = st.columns(2)
+
+# Korelasi gabungan semua negara (pairwise-complete)
+with col1:
+    pooled = pooled_correlation(selected_indicators, *year_range)
+    show_figure(correlation_heatmap(pooled, f"All countries ({year_range[0]}–{year_range[1]})"))
+
+# Korelasi antar tahun untuk satu negara
+with col2:
+    country = st.selectbox("Country", countries, index=countries.index("Indonesia") if "Indonesia" in countries else 0)
+    stats = load_correlation_stats(selected_indicators)
+    show_figure(correlation_heatmap(stats.country_matrix(country, *year_range, selected_indicators), f"{country} ({year_range[0]}–{year_range[1]})"))
+
+st.markdown("### Per-country correlation")
+st.caption("Korelasi antar tahun dalam rentang terpilih; kosong jika observasi kurang dari 3.")
+table = country_pair_table(selected_indicators, *year_range)
+st.dataframe(
+    table.style.background_gradient(cmap="RdBu", vmin=-1, vmax=1).format("{:.2f}", na_rep="–"),
+    use_container_width=True
+)
+
+end_run()
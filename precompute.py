@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from aggregates import (
+    build_group_rollups,
+    build_group_stats,
+    group_definitions,
+    read_country_groups,
+    split_rollups,
+)
+from data_store import (
+    ARTIFACT_DIR,
+    ARTIFACT_VERSION,
+    DATA_PATH,
+    GROUPS_PATH,
+    SCHEMA_VERSION,
+    CountryYearIndex,
+    ensure_binary_cache,
+    indicator_columns,
+    read_dataset,
+    source_fingerprint,
+)
+from growth import build_growth_table
+from indicator_stats import build_indicator_stats
+from smoothing import SMOOTHED_ARRAYS, SmoothingTable
+
+KEEP_VERSIONS = 2
+
+
+# Semua turunan yang dipakai halaman, dihitung sekali dari dataset:
+# {nama array: ndarray} + metadata untuk manifest.
+def build_artifacts(df, groups_path=GROUPS_PATH):
+    index = CountryYearIndex(df)
+    columns = indicator_columns(df)
+    years = list(range(index.first_year, index.last_year + 1))
+
+    groups = group_definitions(df, read_country_groups(groups_path))
+    rollups = split_rollups(build_group_rollups(df, groups))
+    growth = build_growth_table(df, rollups)
+    smoothing = SmoothingTable(growth.names, growth.first_year, growth.columns, growth.values)
+
+    arrays = {"positions": index.positions}
+    arrays["rollups"] = np.stack([frame.reindex(index=years, columns=columns).to_numpy(dtype=np.float64)
+                                  for frame in rollups.values()])
+    for stat, arr in build_group_stats(df, groups).items():
+        arrays[f"group_{stat}"] = arr
+    arrays["growth_values"] = growth.values
+    arrays["growth_delta"] = growth.delta
+    arrays["growth_yoy"] = growth.yoy
+    for name in SMOOTHED_ARRAYS:
+        arrays[f"smoothing_{name}"] = smoothing.arrays[name]
+    stats = build_indicator_stats(df)
+    arrays["stats_overall"] = stats.overall
+    arrays["stats_by_year"] = stats.by_year
+
+    meta = {
+        "countries": index.countries,
+        "first_year": index.first_year,
+        "years": years,
+        "columns": columns,
+        "groups": list(rollups),
+        "names": growth.names,
+    }
+    return arrays, meta
+
+
+def _version_name(sources):
+    return f"v{ARTIFACT_VERSION}-{sources['data']['sha256'][:12]}-{sources['groups']['sha256'][:8]}"
+
+
+# Ditulis ke direktori sementara lalu di-rename, dan CURRENT baru diganti
+# setelah versi lengkap, jadi worker yang sedang start tidak pernah membaca
+# versi setengah jadi.
+def write_artifacts(root, arrays, meta, sources):
+    name = _version_name(sources)
+    path = os.path.join(root, name)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    os.makedirs(tmp_path)
+    for key, arr in arrays.items():
+        np.save(os.path.join(tmp_path, f"{key}.npy"), np.ascontiguousarray(arr))
+    manifest = {"version": ARTIFACT_VERSION, "schema": SCHEMA_VERSION, "created": time.time(),
+                "sources": sources, **meta}
+    with open(os.path.join(tmp_path, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    tmp_current = os.path.join(root, f"CURRENT.tmp{os.getpid()}")
+    with open(tmp_current, "w") as f:
+        f.write(name)
+    os.replace(tmp_current, os.path.join(root, "CURRENT"))
+    return path
+
+
+# Simpan versi aktif + (keep - 1) versi terbaru lainnya.
+def prune_versions(root, keep=KEEP_VERSIONS):
+    with open(os.path.join(root, "CURRENT")) as f:
+        current = f.read().strip()
+    versions = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir() and entry.name != current),
+        key=lambda entry: entry.stat().st_mtime, reverse=True,
+    )
+    for entry in versions[max(keep - 1, 0):]:
+        shutil.rmtree(entry.path)
+
+
+def precompute(data_path=DATA_PATH, groups_path=GROUPS_PATH, root=ARTIFACT_DIR, keep=KEEP_VERSIONS):
+    ensure_binary_cache(data_path)
+    sources = {"data": source_fingerprint(data_path), "groups": source_fingerprint(groups_path)}
+    arrays, meta = build_artifacts(read_dataset(data_path), groups_path)
+    os.makedirs(root, exist_ok=True)
+    path = write_artifacts(root, arrays, meta, sources)
+    prune_versions(root, keep)
+    return path, arrays
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute dashboard artifacts for fast cold starts.")
+    parser.add_argument("--out", default=ARTIFACT_DIR, help="artifact root directory")
+    parser.add_argument("--keep", type=int, default=KEEP_VERSIONS, help="versions to keep, incl. the new one")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    path, arrays = precompute(root=args.out, keep=args.keep)
+    size = sum(arr.nbytes for arr in arrays.values())
+    print(f"{len(arrays)} arrays ({size / 1e6:.1f} MB) -> {path} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
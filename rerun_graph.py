@@ -0,0 +1,63 @@
+import streamlit as st
+
+from instrumentation import span
+
+# Graf komputasi per session untuk rerun inkremental. Tiap node (metric,
+# chart, agregat) mendeklarasikan input-nya (negara, tahun awal, tahun akhir,
+# indikator, ...) dan hanya dihitung ulang kalau salah satu input berubah;
+# selain itu hasil rerun sebelumnya dipakai lagi. Input dibandingkan dengan ==,
+# jadi pakai nilai sederhana (str, int, tuple), bukan DataFrame/array.
+#
+# Hasil disimpan di st.session_state (per session, bukan per proses seperti
+# st.cache_*): yang di-cache cuma hasil terakhir per node, jadi memori tetap
+# kecil walaupun kombinasi filter tak terbatas.
+class RerunGraph:
+    def __init__(self, name, state=None):
+        state = st.session_state if state is None else state
+        key = f"_rerun_graph_{name}"
+        if key not in state:
+            state[key] = {}
+        self.name = name
+        self._nodes = state[key]
+        self.hits = 0
+        self.misses = 0
+
+    def fresh(self, node, inputs):
+        entry = self._nodes.get(node)
+        return entry is not None and entry[0] == inputs
+
+    def get(self, node):
+        return self._nodes[node][1]
+
+    def put(self, node, inputs, value):
+        self._nodes[node] = (inputs, value)
+        return value
+
+    def node(self, node, fn, **inputs):
+        if self.fresh(node, inputs):
+            self.hits += 1
+            return self.get(node)
+        self.misses += 1
+        with span(f"recompute.{self.name}.{node}"):
+            return self.put(node, inputs, fn(**inputs))
+
+    # Beberapa node yang lebih murah dibangun sekaligus (mis. figure grid
+    # Overview di worker pool): build(stale) menerima nama node yang basi dan
+    # mengembalikan dict nama -> hasil.
+    def nodes(self, inputs_by_node, build):
+        stale = [node for node, inputs in inputs_by_node.items() if not self.fresh(node, inputs)]
+        self.hits += len(inputs_by_node) - len(stale)
+        self.misses += len(stale)
+        if stale:
+            with span(f"recompute.{self.name}.{'+'.join(stale)}"):
+                built = build(stale)
+            for node in stale:
+                self.put(node, inputs_by_node[node], built[node])
+        return {node: self.get(node) for node in inputs_by_node}
+
+    def clear(self):
+        self._nodes.clear()
+
+
+def select(inputs, names):
+    return {name: inputs[name] for name in names}
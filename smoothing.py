@@ -0,0 +1,109 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_store import load_artifacts
+from growth import load_growth
+from instrumentation import instrumented
+
+WINDOW = 3
+EWM_SPAN = 3
+
+# Label di UI -> nama array di SmoothingTable
+SMOOTHING_OPTIONS = {
+    "None": "raw",
+    f"Rolling mean ({WINDOW}y)": "rolling_mean",
+    f"EWMA (span {EWM_SPAN})": "ewma",
+}
+SMOOTHED_ARRAYS = ["rolling_mean", "rolling_std", "ewma", "zscore"]
+
+
+def _trailing_sum(arr, window):
+    csum = np.cumsum(arr, axis=1)
+    out = csum.copy()
+    out[:, window:] = csum[:, window:] - csum[:, :-window]
+    return out
+
+
+# Rolling mean/std, EWMA dan z-score per entitas untuk semua indikator
+# sekaligus, di atas array entitas x tahun x indikator. NaN dilewati: rolling
+# memakai nilai yang ada di jendela (min 1 titik untuk mean, 2 untuk std),
+# EWMA meneruskan nilai sebelumnya. arrays boleh diberikan langsung (artifact
+# precompute).
+class SmoothingTable:
+    def __init__(self, names, first_year, columns, values, window=WINDOW, span=EWM_SPAN, arrays=None):
+        self.names = list(names)
+        self.first_year = first_year
+        self.last_year = first_year + values.shape[1] - 1
+        self.columns = list(columns)
+        self._name_pos = {name: i for i, name in enumerate(self.names)}
+        self._col_pos = {col: k for k, col in enumerate(self.columns)}
+        if arrays is not None:
+            self.arrays = {"raw": values, **arrays}
+            return
+
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        n = _trailing_sum(valid.astype(np.float64), window)
+        total = _trailing_sum(filled, window)
+        total_sq = _trailing_sum(filled ** 2, window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rolling_mean = np.where(n > 0, total / n, np.nan)
+            variance = np.where(n > 1, (total_sq - total ** 2 / n) / (n - 1), np.nan)
+        rolling_std = np.sqrt(np.clip(variance, 0, None))
+
+        alpha = 2 / (span + 1)
+        ewma = np.full_like(values, np.nan)
+        prev = np.full(values[:, 0].shape, np.nan)
+        for t in range(values.shape[1]):
+            cur = values[:, t]
+            prev = np.where(np.isnan(prev), cur, np.where(np.isnan(cur), prev, alpha * cur + (1 - alpha) * prev))
+            ewma[:, t] = prev
+
+        # Negara tanpa data / satu observasi: nanmean & nanstd memberi
+        # RuntimeWarning lewat warnings (bukan errstate), jadi diredam di sini.
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(values, axis=1, keepdims=True)
+            std = np.nanstd(values, axis=1, ddof=1, keepdims=True)
+            zscore = np.where(std > 0, (values - mean) / std, np.nan)
+
+        self.arrays = {
+            "raw": values,
+            "rolling_mean": rolling_mean,
+            "rolling_std": rolling_std,
+            "ewma": ewma,
+            "zscore": zscore,
+        }
+
+    # (tahun, nilai) satu entitas & indikator dalam rentang tahun.
+    def series(self, name, column, start, end, method="raw"):
+        i = self._name_pos.get(name)
+        start = max(int(start), self.first_year)
+        end = min(int(end), self.last_year)
+        if i is None or column not in self._col_pos or end < start:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        years = np.arange(start, end + 1)
+        values = self.arrays[method][i, start - self.first_year:end - self.first_year + 1, self._col_pos[column]]
+        return years, values
+
+    # Beberapa indikator sekaligus sebagai DataFrame dengan kolom 'year'.
+    @instrumented("aggregate.smoothing")
+    def frame(self, name, columns, start, end, method="raw"):
+        out = {}
+        for col in columns:
+            years, out[col] = self.series(name, col, start, end, method)
+        return pd.DataFrame({"year": years, **out})
+
+
+# Dibangun dari array yang sama dengan tabel growth (negara + grup).
+@st.cache_resource(show_spinner=False)
+def load_smoothing():
+    growth = load_growth()
+    artifacts = load_artifacts()
+    arrays = None
+    if artifacts is not None:
+        arrays = {name: artifacts.array(f"smoothing_{name}") for name in SMOOTHED_ARRAYS}
+    return SmoothingTable(growth.names, growth.first_year, growth.columns, growth.values, arrays=arrays)
@@ -0,0 +1,90 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from data_store import BASE_DIR
+
+DEFAULT_PAGES = ["Overview.py"] + sorted(os.path.relpath(p, BASE_DIR) for p in glob.glob(os.path.join(BASE_DIR, "pages", "*.py")))
+TOP_N = 8
+
+# Dijalankan di proses Python baru (cold start) dengan -X importtime. Halaman
+# dieksekusi dalam bare mode Streamlit (tanpa server): widget memberi nilai
+# default, jadi yang terukur = import + render awal.
+_CHILD = """
+import json, runpy, sys, time, warnings, logging
+warnings.filterwarnings("ignore")
+logging.disable(logging.WARNING)
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+error = None
+try:
+    runpy.run_path({page!r}, run_name="__main__")
+except BaseException as exc:
+    error = f"{{type(exc).__name__}}: {{exc}}"
+wall = time.perf_counter() - start
+from lazy_imports import import_times
+print(json.dumps({{"wall": wall, "lazy": import_times(), "error": error}}))
+"""
+
+
+# Baris -X importtime: "import time: self [us] | cumulative | imported package".
+# Hanya import level teratas (tanpa indentasi) yang dijumlahkan per paket akar,
+# supaya sub-import tidak terhitung dua kali.
+def parse_importtime(stderr):
+    per_package = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue
+        per_package[name.strip().split(".")[0]] += int(cumulative) / 1e6
+    return dict(per_package)
+
+
+def profile_page(page, python=sys.executable):
+    code = _CHILD.format(root=BASE_DIR, page=os.path.join(BASE_DIR, page))
+    proc = subprocess.run([python, "-X", "importtime", "-c", code], cwd=BASE_DIR, capture_output=True, text=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1]) if proc.stdout.strip() else {"wall": None, "lazy": {}, "error": proc.stderr[-500:]}
+    imports = parse_importtime(proc.stderr)
+    return {
+        "page": page,
+        "wall": result["wall"],
+        "import_total": sum(imports.values()),
+        "imports": dict(sorted(imports.items(), key=lambda kv: kv[1], reverse=True)),
+        "lazy": result["lazy"],
+        "error": result["error"],
+    }
+
+
+def format_report(profiles, top_n=TOP_N):
+    lines = []
+    for p in profiles:
+        wall = f"{p['wall']:.2f}s" if p["wall"] is not None else "n/a"
+        lines.append(f"{p['page']}: wall {wall}, imports {p['import_total']:.2f}s")
+        for name, seconds in list(p["imports"].items())[:top_n]:
+            lines.append(f"    {name:<28} {seconds * 1000:8.1f} ms")
+        for name, seconds in p["lazy"].items():
+            lines.append(f"    lazy {name:<23} {seconds * 1000:8.1f} ms")
+        if p["error"]:
+            lines.append(f"    error: {p['error']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import time per page and per module.")
+    parser.add_argument("pages", nargs="*", default=DEFAULT_PAGES)
+    parser.add_argument("--top", type=int, default=TOP_N)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args(argv)
+
+    profiles = [profile_page(page) for page in args.pages]
+    print(json.dumps(profiles, indent=2) if args.json else format_report(profiles, args.top))
+
+
+if __name__ == "__main__":
+    main()
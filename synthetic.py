@@ -0,0 +1,214 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import YEAR_BOUNDS, CountryYearIndex, apply_schema, indicator_columns, read_dataset
+
+# Faktor skala -> (kali negara, kali tahun). Tahun dibatasi YEAR_BOUNDS.
+SCALES = {1: (1, 1), 10: (5, 2), 100: (20, 5)}
+
+
+# Dataset lebih besar dengan skema yang sama: tiap negara diduplikasi
+# (country_factor kali, nama "<negara> #k") dan deret tahunnya diulang ke
+# belakang (year_factor kali) dengan noise multiplikatif kecil. Pola NaN dan
+# baris yang hilang ikut diulang, jadi bentuk datanya tetap realistis.
+def scale_dataset(df, country_factor=1, year_factor=1, noise=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    index = CountryYearIndex(df)
+    columns = indicator_columns(df)
+    values = index.dense(df[columns].to_numpy(dtype=np.float64))
+    present = index.positions >= 0
+
+    n_countries, n_years = present.shape
+    values = np.tile(values, (country_factor, year_factor, 1))
+    present = np.tile(present, (country_factor, year_factor))
+    # Blok tahun terakhir negara asli = data asli (tanpa noise).
+    jitter = rng.lognormal(0.0, noise, size=values.shape)
+    jitter[:n_countries, -n_years:] = 1.0
+    values = values * jitter
+
+    total_years = n_years * year_factor
+    first_year = index.last_year - total_years + 1
+    if first_year < YEAR_BOUNDS[0]:
+        raise ValueError(f"{total_years} years ending {index.last_year} do not fit in {YEAR_BOUNDS}")
+    years = np.arange(first_year, first_year + total_years)
+
+    ids = df[["country_name", "country_id"]].drop_duplicates("country_name").astype(str)
+    ids = ids.set_index("country_name").reindex(index.countries)["country_id"].to_numpy()
+    names = np.array([name if k == 0 else f"{name} #{k}" for k in range(country_factor) for name in index.countries])
+    codes = np.array([code if k == 0 else f"{code}{k}" for k in range(country_factor) for code in ids])
+
+    c, y = np.nonzero(present)
+    out = pd.DataFrame(values[c, y], columns=columns)
+    out.insert(0, "year", years[y])
+    out.insert(0, "country_id", codes[c])
+    out.insert(0, "country_name", names[c])
+    out = apply_schema(out[[col for col in df.columns if col in out.columns]])
+    return out.sort_values(["country_name", "year"], ignore_index=True)
+
+
+def scaled(df, scale):
+    return scale_dataset(df, *SCALES[scale])
+
+
+# ======================================
+# Generator dataset besar (entitas subnasional, kuartalan/bulanan)
+# ======================================
+FREQUENCIES = {"annual": 1, "quarterly": 4, "monthly": 12}
+NAN_PATTERNS = ["none", "random", "blocks", "tail", "rows"]
+
+
+# Statistik per indikator dari dataset asli sebagai dasar nilai sintetis:
+# indikator level (USD) di skala log, indikator persen di skala biasa.
+def _column_profiles(base, columns):
+    profiles = {}
+    for col in columns:
+        values = base[col].dropna().to_numpy(dtype=np.float64)
+        level = "%" not in col and (values > 0).all()
+        if level:
+            values = np.log(values)
+        q05, q50, q95 = np.quantile(values, [0.05, 0.5, 0.95])
+        profiles[col] = {"level": level, "center": q50, "spread": max((q95 - q05) / 3.3, 1e-6),
+                         "nonnegative": level or values.min() >= 0}
+    return profiles
+
+
+# Entitas ke-i = negara asli ke-(i % C); di atas jumlah negara asli jadi
+# "<negara> / Region k" dengan country_id induknya, jadi ikut region dan
+# kelompok pendapatan negara induk di aggregates.group_definitions.
+def _entities(base, n_entities):
+    ids = base[["country_name", "country_id"]].drop_duplicates("country_name").astype(str)
+    names, codes = ids["country_name"].to_numpy(), ids["country_id"].to_numpy()
+    i = np.arange(n_entities)
+    parent, k = i % len(names), i // len(names)
+    entity_names = np.where(k == 0, names[parent], np.char.add(np.char.add(names[parent].astype(str), " / Region "), k.astype(str)))
+    return entity_names, codes[parent]
+
+
+# Seri per entitas x periode x indikator: indikator level = random walk di
+# log (tren tumbuh + guncangan) yang berakhir di sekitar nilai sekarang,
+# indikator persen = AR(1) di sekitar rata-rata entitas. GDP = GDP per kapita x populasi dan GNI ~ GDP supaya bobot agregasi
+# (populasi = GDP / GDP per kapita) tetap masuk akal.
+def _simulate(profiles, n_entities, n_periods, periods_per_year, rng):
+    columns = list(profiles)
+    out = np.empty((n_entities, n_periods, len(columns)))
+    for k, col in enumerate(columns):
+        p = profiles[col]
+        start = rng.normal(p["center"], p["spread"], size=(n_entities, 1))
+        if p["level"]:
+            drift = rng.normal(0.03, 0.01, size=(n_entities, 1)) / periods_per_year
+            shocks = rng.normal(0.0, 0.04 / np.sqrt(periods_per_year), size=(n_entities, n_periods))
+            walk = np.cumsum(drift + shocks, axis=1)
+            out[:, :, k] = np.exp(start + walk - walk[:, -1:])
+        else:
+            phi = 0.7 ** (1 / periods_per_year)
+            noise = rng.normal(0.0, p["spread"] * 0.3, size=(n_entities, n_periods))
+            series = np.empty((n_entities, n_periods))
+            series[:, 0] = start[:, 0]
+            for t in range(1, n_periods):
+                series[:, t] = start[:, 0] + phi * (series[:, t - 1] - start[:, 0]) + noise[:, t]
+            out[:, :, k] = np.clip(series, 0, None) if p["nonnegative"] else series
+
+    pos = {col: k for k, col in enumerate(columns)}
+    gdp, gdp_pc, gni = "GDP (Current USD)", "GDP per Capita (Current USD)", "Gross National Income (USD)"
+    if gdp in pos and gdp_pc in pos:
+        population = np.exp(rng.normal(15.5, 1.8, size=(n_entities, 1)))
+        growth = np.cumprod(1 + rng.normal(0.01 / periods_per_year, 0.002, size=(n_entities, n_periods)), axis=1)
+        out[:, :, pos[gdp]] = out[:, :, pos[gdp_pc]] * population * growth
+        if gni in pos:
+            out[:, :, pos[gni]] = out[:, :, pos[gdp]] * rng.normal(1.0, 0.03, size=(n_entities, n_periods))
+    return out
+
+
+# Mask NaN (True = hilang) untuk entitas x periode x indikator.
+#   "random" -> sel hilang acak (rate)
+#   "blocks" -> indikator baru dilaporkan mulai periode tertentu (awal deret kosong)
+#   "tail"   -> periode terakhir belum dilaporkan (reporting lag) untuk sebagian entitas
+#   "rows"   -> seluruh baris (entitas, periode) tidak ada; dibuang dari output
+def _nan_mask(shape, pattern, rate, rng):
+    n_entities, n_periods, n_columns = shape
+    if pattern == "none" or rate <= 0:
+        return np.zeros(shape, dtype=bool)
+    if pattern == "random":
+        return rng.random(shape) < rate
+    periods = np.arange(n_periods)[None, :, None]
+    if pattern == "blocks":
+        start = rng.integers(0, max(int(2 * rate * n_periods), 1) + 1, size=(n_entities, 1, n_columns))
+        return periods < start
+    if pattern == "tail":
+        lag = rng.integers(1, max(int(2 * rate * n_periods), 1) + 1, size=(n_entities, 1, n_columns))
+        late = rng.random((n_entities, 1, n_columns)) < 0.5
+        return late & (periods >= n_periods - lag)
+    if pattern == "rows":
+        return np.repeat(rng.random((n_entities, n_periods, 1)) < rate, n_columns, axis=2)
+    raise ValueError(f"Unknown NaN pattern {pattern!r}; expected one of {NAN_PATTERNS}")
+
+
+# Dataset sintetis dengan nama kolom indikator yang sama dengan dataset asli.
+# frequency="annual" -> skema data_store (satu baris per entitas per tahun),
+# bisa langsung dipakai semua halaman lewat DASHBOARD_DATA_PATH. Frekuensi
+# kuartalan/bulanan menambah kolom "period" (1..4 / 1..12) untuk menguji
+# jalur feed mentah; skema dashboard sendiri tetap tahunan.
+def generate_dataset(n_entities=1000, n_years=16, last_year=2025, frequency="annual",
+                     nan_pattern="random", nan_rate=0.05, base=None, seed=0):
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency {frequency!r}; expected one of {list(FREQUENCIES)}")
+    first_year = last_year - n_years + 1
+    if first_year < YEAR_BOUNDS[0] or last_year > YEAR_BOUNDS[1]:
+        raise ValueError(f"{first_year}-{last_year} outside {YEAR_BOUNDS}")
+
+    base = base if base is not None else read_dataset()
+    rng = np.random.default_rng(seed)
+    columns = indicator_columns(base)
+    periods_per_year = FREQUENCIES[frequency]
+    n_periods = n_years * periods_per_year
+
+    values = _simulate(_column_profiles(base, columns), n_entities, n_periods, periods_per_year, rng)
+    missing = _nan_mask(values.shape, nan_pattern, nan_rate, rng)
+    keep_rows = ~missing.all(axis=2) if nan_pattern == "rows" else np.ones(values.shape[:2], dtype=bool)
+    values[missing] = np.nan
+
+    names, codes = _entities(base, n_entities)
+    e, t = np.nonzero(keep_rows)
+    out = pd.DataFrame(values[e, t], columns=columns)
+    if periods_per_year > 1:
+        out.insert(0, "period", (t % periods_per_year + 1).astype(np.int8))
+    out.insert(0, "year", first_year + t // periods_per_year)
+    out.insert(0, "country_id", codes[e])
+    out.insert(0, "country_name", names[e])
+    if periods_per_year > 1:
+        return out
+    out = apply_schema(out[[col for col in base.columns if col in out.columns]])
+    return out.sort_values(["country_name", "year"], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a schema-compatible synthetic dataset.")
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=100)
+    parser.add_argument("--last-year", type=int, default=2025)
+    parser.add_argument("--frequency", choices=list(FREQUENCIES), default="annual")
+    parser.add_argument("--nan-pattern", choices=NAN_PATTERNS, default="random")
+    parser.add_argument("--nan-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help=".csv, .parquet or .arrow")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df = generate_dataset(args.entities, args.years, args.last_year, args.frequency,
+                          args.nan_pattern, args.nan_rate, seed=args.seed)
+    ext = os.path.splitext(args.out)[1].lower()
+    if ext == ".parquet":
+        df.to_parquet(args.out, index=False)
+    elif ext in (".arrow", ".feather"):
+        df.to_feather(args.out)
+    else:
+        df.to_csv(args.out, index=False)
+    print(f"{len(df):,} rows x {df.shape[1]} columns -> {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from downsample import METHODS, downsample_indices
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("nan_rate", [0.0, 0.01, 0.05, 0.5])
+def test_random_nans_stay_within_budget(method, nan_rate):
+    rng = np.random.default_rng(0)
+    x = np.arange(20_000, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=x.size))
+    y[rng.random(x.size) < nan_rate] = np.nan
+
+    idx = downsample_indices(x, y, 800, method)
+
+    assert len(idx) <= 800
+    assert (np.diff(idx) > 0).all()
+    if nan_rate:
+        # Celah tetap terlihat sebagai NaN, tapi tidak pernah dua NaN berurutan.
+        kept_nan = np.isnan(y[idx])
+        assert kept_nan.any()
+        assert not (kept_nan[1:] & kept_nan[:-1]).any()
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_extremes_kept_without_nans(method):
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 300)
+    y[1234], y[8765] = 5.0, -5.0
+
+    idx = downsample_indices(x, y, 400, method)
+
+    assert len(idx) <= 400
+    assert {0, 1234, 8765, len(x) - 1} <= set(idx.tolist())